@@ -0,0 +1,63 @@
+"""measures decoding documents nested four Objects deep, through Object, list of Object and dict of Object fields
+
+run with `poetry run python benchmarks/nested_decode.py [width]`
+"""
+
+import json
+import sys
+import timeit
+
+from sushitools.types import Object
+
+
+@Object(slots=True)
+class Leaf:
+    id: int
+    name: str
+    score: float
+
+
+@Object(slots=True)
+class Branch:
+    name: str
+    leaves: list[Leaf]
+    index: dict[str, Leaf]
+
+
+@Object(slots=True)
+class Node:
+    name: str
+    main: Branch
+    branches: list[Branch]
+
+
+@Object(slots=True)
+class Root:
+    nodes: list[Node]
+    by_name: dict[str, Node]
+
+
+def make_document(width: int) -> dict:
+    leaves = [{"id": i, "name": "leaf %d" % i, "score": i / 2} for i in range(width)]
+    branch = {"name": "branch", "leaves": leaves, "index": {leaf["name"]: leaf for leaf in leaves}}
+    nodes = [{"name": "node %d" % i, "main": branch, "branches": [branch] * width} for i in range(width)]
+    return {"nodes": nodes, "by_name": {node["name"]: node for node in nodes}}
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    data = json.dumps(make_document(width))
+    parsed = json.loads(data)
+    objects = data.count("{")
+
+    number = 20
+    from_string = timeit.timeit(lambda: Root.from_json(data), number=number) / number
+    from_dict = timeit.timeit(lambda: Root.from_json(parsed), number=number) / number
+    print(f"width {width}: {objects} json objects, {len(data) / 2**10:.1f} KiB")
+    print(f"  from_json(str):  {from_string * 1e3:8.2f} ms")
+    print(f"  from_json(dict): {from_dict * 1e3:8.2f} ms ({from_dict / objects * 1e6:.2f} µs/json object)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""measures the memory held by Object instances with a per-instance `__dict__` and with `__slots__`
+
+run with `poetry run python benchmarks/object_memory.py [count]`
+"""
+
+import sys
+import tracemalloc
+
+from sushitools.types import Object
+
+
+@Object
+class DictRecord:
+    id: int
+    name: str
+    score: float
+    active: bool
+
+
+@Object(slots=True)
+class SlotsRecord:
+    id: int
+    name: str
+    score: float
+    active: bool
+
+
+def measure(cls: type, count: int) -> int:
+    # the field values are shared between both layouts, so only the instances themselves are measured
+    ids = list(range(count))
+    names = [str(i) for i in range(100)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [cls(id=i, name=names[i % 100], score=0.5, active=True) for i in ids]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del records
+    return after - before
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    dict_size = measure(DictRecord, count)
+    slots_size = measure(SlotsRecord, count)
+    print(f"{count} records")
+    print(f"  __dict__:  {dict_size / 2**20:8.2f} MiB ({dict_size / count:6.1f} bytes/record)")
+    print(f"  __slots__: {slots_size / 2**20:8.2f} MiB ({slots_size / count:6.1f} bytes/record)")
+    print(f"  saved:     {100 * (1 - slots_size / dict_size):7.1f} %")
+
+
+if __name__ == "__main__":
+    main()
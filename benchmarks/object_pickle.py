@@ -0,0 +1,80 @@
+"""measures pickling Object instances as constructor arguments against default pickling of their `__dict__`, both on
+their own and when sent to worker processes
+
+run with `poetry run python benchmarks/object_pickle.py [count]`
+"""
+
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Pool
+
+from sushitools.types import Object
+
+
+@Object
+class Record:
+    id: int
+    name: str
+    score: float
+    active: bool
+
+
+@Object
+class DefaultRecord:
+    id: int
+    name: str
+    score: float
+    active: bool
+
+
+# falls back to the default pickling of `object`
+del DefaultRecord.__reduce__
+
+CHUNK_SIZE = 10_000
+
+
+def count_records(records: list) -> int:
+    return len(records)
+
+
+def chunks(records: list) -> list[list]:
+    return [records[i:i + CHUNK_SIZE] for i in range(0, len(records), CHUNK_SIZE)]
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def measure(cls: type, count: int):
+    records = [cls(id=i, name="record %d" % (i % 1000), score=i / 3, active=i % 2 == 0) for i in range(count)]
+
+    data = pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL)
+    dumps = timed(lambda: pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL))
+    loads = timed(lambda: pickle.loads(data))
+
+    with Pool(4) as pool:
+        pool_time = timed(lambda: sum(pool.map(count_records, chunks(records))))
+    with ProcessPoolExecutor(4) as executor:
+        executor_time = timed(lambda: sum(executor.map(count_records, chunks(records))))
+
+    print(f"  {cls.__name__}:")
+    print(f"    size:                {len(data) / 2**20:8.2f} MiB ({len(data) / count:6.1f} bytes/record)")
+    print(f"    dumps / loads:       {dumps:8.3f} s / {loads:.3f} s")
+    print(f"    Pool.map:            {pool_time:8.3f} s")
+    print(f"    ProcessPoolExecutor: {executor_time:8.3f} s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"{count} records")
+    measure(DefaultRecord, count)
+    measure(Record, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""measures decoding a large json array file of records with `from_json_many` and with `from_json_parallel`
+
+run with `poetry run python benchmarks/parallel_decode.py [count] [workers]`
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sushitools.types import Object
+
+
+@Object(slots=True)
+class Record:
+    id: int
+    name: str
+    score: float
+    active: bool
+    tags: list[str]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "records.json")
+        with open(path, "w") as fp:
+            json.dump([
+                {"id": i, "name": "record %d" % i, "score": i / 3, "active": i % 2 == 0, "tags": ["a", "b"]}
+                for i in range(count)
+            ], fp)
+
+        start = time.perf_counter()
+        serial = Record.from_json_many(open(path).read())
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = Record.from_json_parallel(path, workers=workers)
+        parallel_time = time.perf_counter() - start
+
+        assert len(serial) == len(parallel) == count
+        print(f"{count} records, {os.path.getsize(path) / 2**20:.1f} MiB")
+        print(f"  from_json_many:     {serial_time:8.3f} s")
+        print(f"  from_json_parallel: {parallel_time:8.3f} s ({workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""measures the memory held by decoded records with and without interning their low-cardinality string fields
+
+run with `poetry run python benchmarks/string_pool.py [count]`
+"""
+
+import json
+import sys
+import tracemalloc
+
+from sushitools.types import Object, interned
+
+
+@Object(slots=True)
+class Record:
+    id: int
+    status: str
+    country: str
+    tags: list[str]
+
+
+@interned("status", "country", "tags")
+@Object(slots=True)
+class InternedRecord:
+    id: int
+    status: str
+    country: str
+    tags: list[str]
+
+
+STATUSES = ["active", "inactive", "pending", "banned"]
+COUNTRIES = ["denmark", "sweden", "norway", "finland", "iceland"]
+TAGS = ["premium", "beta", "staff", "legacy"]
+
+
+def measure(cls: type, data: str) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = cls.from_json_many(data)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del records
+    return after - before
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    data = json.dumps([
+        {
+            "id": i,
+            "status": STATUSES[i % len(STATUSES)],
+            "country": COUNTRIES[i % len(COUNTRIES)],
+            "tags": [TAGS[i % len(TAGS)], TAGS[(i + 1) % len(TAGS)]],
+        }
+        for i in range(count)
+    ])
+
+    plain_size = measure(Record, data)
+    interned_size = measure(InternedRecord, data)
+    print(f"{count} records")
+    print(f"  plain:    {plain_size / 2**20:8.2f} MiB ({plain_size / count:6.1f} bytes/record)")
+    print(f"  interned: {interned_size / 2**20:8.2f} MiB ({interned_size / count:6.1f} bytes/record)")
+    print(f"  saved:    {100 * (1 - interned_size / plain_size):7.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
+import asyncio
+import codecs
 import json
-from typing import Callable, Dict, Type, Generic, TypeVar, Any, Self
+import os
+import re
+from typing import Callable, Dict, Type, Generic, TypeVar, Any, Self, IO, Iterator, AsyncIterator
 from .primitive import is_primitive
 
 
@@ -198,3 +202,154 @@ def to_json(
         return encode_fn(src, **kwargs)
     else:
         return default_encoder().encode(src, **kwargs)
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# the characters a json number can continue with
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+
+
+def iter_json(
+    src: str | os.PathLike | IO, *, chunk_size: int = 64 * 1024
+) -> Iterator[any]:
+    """lazily decodes every value of a NDJSON (or otherwise whitespace separated) stream, or every element of a
+    single top-level json array, after which only whitespace may follow. only the data of the value being decoded is
+    kept in memory, so the size of the source doesn't matter. the values are decoded with the standard library
+    scanner, as decode functions hooked on the default decoder can only decode complete documents
+
+    Args:
+        src (str | os.PathLike | IO): a path or a text/binary file-like object to read the json from
+        chunk_size (int): the amount of data read from the source at a time. defaults to 64 KiB
+
+    Returns:
+        Iterator[any]: an iterator over the decoded values
+    """
+
+    if isinstance(src, (str, os.PathLike)):
+        with open(src, "rb") as fp:
+            yield from iter_json(fp, chunk_size=chunk_size)
+        return
+
+    scanner = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, eof = "", 0, False
+    size = chunk_size
+
+    def fill() -> None:
+        nonlocal buffer, pos, eof
+        chunk = src.read(size)
+        if not chunk:
+            eof = True
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = text_decoder.decode(chunk, final=eof)
+        buffer, pos = buffer[pos:] + chunk, 0
+
+    def skip_whitespace() -> bool:
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return pos < len(buffer)
+            fill()
+
+    if not skip_whitespace():
+        return
+    in_array = buffer[pos] == "["
+    if in_array:
+        pos += 1
+    expect_separator = False
+
+    while skip_whitespace():
+        if in_array:
+            if buffer[pos] == "]":
+                pos += 1
+                if skip_whitespace():
+                    raise json.JSONDecodeError("Extra data", buffer, pos)
+                return
+            if expect_separator:
+                if buffer[pos] != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                pos += 1
+                expect_separator = False
+                continue
+
+        try:
+            value, end = scanner.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            value, end = None, len(buffer)
+
+        # a value running up to the end of the buffer may just be cut off, so it is only accepted once more data has
+        # been read or the source has run out. a number may also be cut off right after a `.` or an exponent, which
+        # the scanner stops before, so it needs a character after it which cannot continue it
+        if not eof and (
+            end >= len(buffer)
+            or type(value) in (int, float) and _NUMBER_TAIL.match(buffer, end).end() >= len(buffer)
+        ):
+            # read increasingly bigger chunks to not rescan very big values too many times
+            size *= 2
+            fill()
+            continue
+
+        size = chunk_size
+        expect_separator = True
+        pos = end
+        yield value
+
+    if in_array:
+        raise json.JSONDecodeError("Unterminated json array", buffer, pos)
+
+
+async def _read_line(reader: asyncio.StreamReader) -> bytes:
+    parts: list[bytes] = []
+    while True:
+        try:
+            parts.append(await reader.readuntil(b"\n"))
+            break
+        except asyncio.LimitOverrunError as e:
+            # the line is longer than the buffer limit of the reader, so it is taken out of the buffer in pieces
+            parts.append(await reader.readexactly(e.consumed))
+        except asyncio.IncompleteReadError as e:
+            parts.append(e.partial)
+            break
+
+    return b"".join(parts)
+
+
+async def aiter_json(
+    reader: asyncio.StreamReader,
+    *,
+    decoder: JSONDecoder = None,
+    offload_size: int = 256 * 1024,
+    executor: Any = None,
+) -> AsyncIterator[any]:
+    """asynchronously decodes every line of a NDJSON stream. a line is only read from the reader once the previous
+    value has been consumed, so the reader stops reading from its transport while the consumer is busy. lines of at
+    least `offload_size` bytes are decoded in `executor`, so big values don't block the event loop
+
+    Args:
+        reader (asyncio.StreamReader): the reader to read the NDJSON stream from
+        decoder (JSONDecoder): the decoder used for decoding every line. if `None` it will fall back to the default
+        decoder
+        offload_size (int): the size from which lines are decoded in the executor. defaults to 256 KiB
+        executor (concurrent.futures.Executor): the executor used for decoding big lines. if `None` the default
+        executor of the event loop is used
+
+    Returns:
+        AsyncIterator[any]: an asynchronous iterator over the decoded values
+    """
+
+    if decoder is None:
+        decoder = default_decoder()
+
+    loop = asyncio.get_running_loop()
+    while line := await _read_line(reader):
+        if line.isspace():
+            continue
+
+        if len(line) >= offload_size:
+            yield await loop.run_in_executor(executor, decoder.decode, line)
+        else:
+            yield decoder.decode(line)
@@ -1,2 +1,4 @@
 from .dataenum import dataenum
-from .object import Object, fields, is_object, ObjectField, keymap
+from .object import Object, fields, is_object, ObjectField, keymap, interned, IdentityMap
+from .objectarray import ObjectArray
+from .objectstore import ObjectStore
@@ -1,21 +1,232 @@
+import asyncio
+import contextlib
+import copy
+import functools
+from collections import OrderedDict
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+import struct
+from concurrent.futures import Future, ProcessPoolExecutor
+from json.encoder import encode_basestring_ascii
 from types import GenericAlias
-from typing import TypeVar, Callable, Dict, Any
-from ..json import JSONEncoder, JSONDecoder, default_encoder, default_decoder
-from ..primitive import any_type_of, is_container, camel_to_snake, is_primitive
+from typing import TypeVar, Callable, Dict, Any, IO, Iterable, Iterator, AsyncIterator
+from ..json import JSONEncoder, JSONDecoder, default_encoder, default_decoder, iter_json, aiter_json
+from ..primitive import any_type_of, is_container, camel_to_snake, is_primitive, snake_to_camel, snake_to_lower_camel
 
 T = TypeVar("T")
 
+# everything Objects can be decoded from, besides already parsed data. paths are memory-mapped
+JSONData = str | bytes | bytearray | memoryview | os.PathLike
+
 
 __OBJECT_NAME = "__object_name__"
 __OBJECT_FIELDS = "__object_fields__"
 __OBJECT_FIELDS_LEN = "__object_fields_len__"
 __OBJECT_KEY_MAPS = "__object_key_maps__"
+__OBJECT_KEY_TABLES = "__object_key_tables__"
+__OBJECT_PROJECTED_DECODERS = "__object_projected_decoders__"
+__OBJECT_ROW_CODECS = "__object_row_codecs__"
+__OBJECT_INTERNED = "__object_interned__"
+__OBJECT_STRING_POOL = "__object_string_pool__"
+__OBJECT_STRING_POOL_SIZE = "__object_string_pool_size__"
+__OBJECT_DECODER = "__object_decoder__"
+__OBJECT_LAZY_DECODER = "__object_lazy_decoder__"
+__OBJECT_LAZY_DATA = "__object_lazy_data__"
+__OBJECT_COW_DATA = "__object_cow_data__"
+__OBJECT_CLONER = "__object_cloner__"
+__OBJECT_DIFFER = "__object_differ__"
+__OBJECT_VARIANT = "__object_variant__"
+__OBJECT_ENCODER = "__object_encoder__"
+__OBJECT_JSON_WRITER = "__object_json_writer__"
+__OBJECT_BINARY_CODEC = "__object_binary_codec__"
+__OBJECT_TRACK_CHANGES = "__object_track_changes__"
+__OBJECT_CHANGES = "__object_changes__"
+__OBJECT_DELTA_ENCODER = "__object_delta_encoder__"
+__OBJECT_FROZEN = "__object_frozen__"
+__OBJECT_HASH = "__object_hash__"
+__OBJECT_FINGERPRINTER = "__object_fingerprinter__"
+__OBJECT_FINGERPRINT = "__object_fingerprint__"
+__OBJECT_KEY = "__object_key__"
+
+__MISSING = object()
+
+# the amount of unknown keys memoized by a key table, and the amount of key tables (one per key demangler) kept
+__KEY_TABLE_CACHE_SIZE = 1024
+__KEY_TABLES_MAX = 16
 
 __OBJECT_INIT_TEMPLATE = """\
 def __init__(self, {args}):
 {assignments}
 """
 
+# swaps a string for the equal one already in the pool of its class. the pool only takes new strings until it is full
+__INTERN_EXPRESSION = "POOL.get({value}) or (POOL.setdefault({value}, {value}) if len(POOL) < POOL_SIZE else {value})"
+
+__OBJECT_FIND_FIELDS = """\
+    keys = KEY_TABLES.get(key_demangler)
+    if keys is None:
+        keys = MAKE_KEY_TABLE(key_demangler)
+    found = {}
+    for key, value in data.items():
+        name = keys[key]
+        if name is not None:
+            found[name] = value\
+"""
+
+__OBJECT_DECODER_TEMPLATE = """\
+def __decode(data, key_demangler):
+{find}
+{conversions}
+{result}
+"""
+
+# decoders of Objects with an identity map return the instance already in the map for the key of the data, and
+# update its fields with the decoded values. frozen instances are replaced instead, if any field differs. data whose
+# key is missing or null doesn't use the map, as its key field only holds the default value
+__OBJECT_IDENTITY_TEMPLATE = """\
+    if found.get({name!r}) is None:
+        return OBJECT({args})
+    res = IDENTITIES.get(v{key})
+    if res is None:
+        return IDENTITIES.put(v{key}, OBJECT({args}))
+{updates}
+    return res\
+"""
+
+__OBJECT_LAZY_DECODER_TEMPLATE = """\
+def __decode(data, key_demangler):
+{find}
+    res = OBJECT.__new__(OBJECT)
+    res.__dict__[LAZY_DATA] = (found, key_demangler)
+    return res
+"""
+
+__OBJECT_BINARY_TEMPLATE = """\
+def __write(self, out):
+{writes}
+
+def __read(data, pos):
+{reads}
+    return OBJECT({args}), pos
+"""
+
+__OBJECT_TRACKER_TEMPLATE = """\
+def __setattr__(self, name, value):
+    SETATTR(self, name, value)
+    if name in FIELDS:
+        changes = GETATTR(self, CHANGES, None)
+        if changes is None:
+            SETATTR(self, CHANGES, {name})
+        else:
+            changes.add(name)
+"""
+
+__OBJECT_EQ_TEMPLATE = """\
+def __eq__(self, other):
+    if self is other:
+        return True
+    if not isinstance(other, OBJECT):
+        return NotImplemented
+    return ({values}) == ({other_values})
+
+def __hash__(self):
+    return hash(({values}))
+
+def __cached_hash__(self):
+    h = GETATTR(self, HASH, None)
+    if h is None:
+        h = hash(({values}))
+        SETATTR(self, HASH, h)
+    return h
+"""
+
+__OBJECT_FROZEN_TEMPLATE = """\
+def __setattr__(self, name, value):
+    raise AttributeError(ERROR % name)
+
+def __delattr__(self, name):
+    raise AttributeError(ERROR % name)
+"""
+
+__OBJECT_ROWS_TEMPLATE = """\
+def __from_rows(rows):
+    return [OBJECT({args}) for {targets} in rows]
+
+def __to_rows(objects):
+    return [({values}) for o in objects]
+"""
+
+__OBJECT_FINGERPRINT_TEMPLATE = """\
+def __fingerprint(self):
+    return BLAKE2B(HEADER + ENCODE(({values})).encode(), digest_size=16).hexdigest()
+"""
+
+__OBJECT_REDUCE_TEMPLATE = """\
+def __reduce__(self):
+    return OBJECT, ({values})
+"""
+
+__OBJECT_CLONER_TEMPLATE = """\
+def __shallow(other):
+    res = OBJECT.__new__(OBJECT)
+{shallow}
+    return res
+
+def __cow(other):
+    res = COW.__new__(COW)
+{cow}
+    res.__dict__[COW_DATA] = {{{shared}}}
+    return res
+
+def __deep(other):
+    res = OBJECT.__new__(OBJECT)
+{deep}
+    return res
+"""
+
+__OBJECT_DIFFER_TEMPLATE = """\
+def __diff(a, b):
+    patch = {{}}
+{comparisons}
+    return patch
+"""
+
+__OBJECT_COW_FIELD_TEMPLATE = """\
+def __copy_{i}(self):
+    v = self.__dict__[COW_DATA][{name!r}]
+    if v is not None:
+        v = {copy}
+    self.__dict__[{name!r}] = v
+    return v
+"""
+
+__OBJECT_LAZY_FIELD_TEMPLATE = """\
+def __convert_{i}(self):
+    found, key_demangler = self.__dict__[LAZY_DATA]
+{conversion}
+    self.__dict__[{name!r}] = v{i}
+    return v{i}
+"""
+
+__OBJECT_ENCODER_TEMPLATE = """\
+def __encode(self, skip_null, use_default_value):
+    d = {{}}
+{conversions}
+    return d
+"""
+
+__OBJECT_JSON_WRITER_TEMPLATE = """\
+def __write(self, skip_null, use_default_value):
+{conversions}
+    if skip_null:
+        return "{{" + ", ".join([k + j for k, j in zip(KEYS, ({values})) if j is not None]) + "}}"
+    return TEMPLATE % ({values})
+"""
+
 
 def __get_type_repr(t: type) -> str:
     if isinstance(t, GenericAlias):
@@ -95,6 +306,33 @@ def fields(cls: T) -> list[ObjectField]:
     return [field for field in getattr(cls, __OBJECT_FIELDS).values()]
 
 
+def __decode_buffer(data: memoryview, decoder: JSONDecoder, **kwargs) -> any:
+    # a view over a whole bytes object is decoded through that object, which doesn't need a copy
+    if isinstance(data.obj, (bytes, bytearray)) and data.c_contiguous and data.nbytes == len(data.obj):
+        return decoder.decode(data.obj, **kwargs)
+
+    # some decode functions take buffers as they are, others (like `json.loads`) refuse them before parsing
+    try:
+        return decoder.decode(data, **kwargs)
+    except TypeError:
+        return decoder.decode(data.tobytes(), **kwargs)
+
+
+def __parse_data(data: any, decoder: JSONDecoder, **kwargs) -> any:
+    if isinstance(data, (str, bytes, bytearray)):
+        return decoder.decode(data, **kwargs)
+    elif isinstance(data, memoryview):
+        return __decode_buffer(data, decoder, **kwargs)
+    elif isinstance(data, os.PathLike):
+        with open(data, "rb") as fp:
+            if os.fstat(fp.fileno()).st_size == 0:
+                return decoder.decode(b"", **kwargs)
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                return __decode_buffer(view, decoder, **kwargs)
+
+    return data
+
+
 def __to_json(
     self: T,
     *,
@@ -102,118 +340,526 @@ def __to_json(
     key_mangler: Callable[[str], str] = lambda x: x,
     skip_null: bool = False,
     use_default_value: bool = False,
+    direct: bool = False,
+    changed_only: bool = False,
     **kwargs,
 ) -> str:
     if not is_object(self):
         raise Exception("cannot encode non Object class to json")
 
+    if changed_only:
+        return encoder.encode(__encode_changes(self, skip_null, use_default_value), **kwargs)
+
+    if direct:
+        # the precompiled template always produces the same output as `json.dumps` with its default arguments, so
+        # neither a hooked encoder nor any encoder arguments can be honored
+        if kwargs:
+            raise Exception("direct json encoding does not take any encoder arguments")
+        return self.__object_json_writer__(skip_null, use_default_value)
+
     return encoder.encode(
-        __to_dict(self, skip_null=skip_null, use_default_value=use_default_value),
+        self.__object_encoder__(skip_null, use_default_value),
         **kwargs,
     )
 
 
+def __make_writer(fp: IO | Any) -> Callable[[str], any]:
+    # text files are written as they are, while binary files and sockets are given the utf-8 encoded data
+    if hasattr(fp, "sendall"):
+        return lambda data: fp.sendall(data.encode())
+    elif isinstance(fp, io.TextIOBase):
+        return fp.write
+
+    return lambda data: fp.write(data.encode())
+
+
+def __dump_json(
+    self: T,
+    fp: IO | Any,
+    *,
+    encoder: JSONEncoder = default_encoder(),
+    skip_null: bool = False,
+    use_default_value: bool = False,
+    direct: bool = False,
+    chunk_size: int = 64 * 1024,
+    **kwargs,
+):
+    if not is_object(self):
+        raise Exception("cannot encode non Object class to json")
+
+    data = self.to_json(
+        encoder=encoder, skip_null=skip_null, use_default_value=use_default_value, direct=direct, **kwargs
+    )
+    write = __make_writer(fp)
+    for i in range(0, len(data), chunk_size):
+        write(data[i:i + chunk_size])
+
+
+def __dump_json_many(
+    cls: T,
+    objects: Iterable[T],
+    fp: IO | Any,
+    *,
+    ndjson: bool = True,
+    encoder: JSONEncoder = default_encoder(),
+    skip_null: bool = False,
+    use_default_value: bool = False,
+    direct: bool = False,
+    chunk_size: int = 64 * 1024,
+    **kwargs,
+):
+    if not is_object(cls):
+        raise Exception("cannot encode non Object class to json")
+
+    # the records are encoded one at a time and written once at least `chunk_size` characters have been encoded, so
+    # only a chunk of the output is ever kept in memory. NDJSON is written one record per line, otherwise the records
+    # are written as a single json array
+    write = __make_writer(fp)
+    separator = "\n" if ndjson else ", "
+    parts: list[str] = [] if ndjson else ["["]
+    size = 0
+    first = True
+    for obj in objects:
+        if not isinstance(obj, cls):
+            raise Exception("%s Object cannot encode '%s'" % (getattr(cls, __OBJECT_NAME), type(obj).__name__))
+
+        data = obj.to_json(
+            encoder=encoder, skip_null=skip_null, use_default_value=use_default_value, direct=direct, **kwargs
+        )
+        if ndjson:
+            parts += (data, separator)
+        elif first:
+            parts.append(data)
+        else:
+            parts += (separator, data)
+        first = False
+
+        size += len(data) + 1
+        if size >= chunk_size:
+            write("".join(parts))
+            parts.clear()
+            size = 0
+
+    if not ndjson:
+        parts.append("]")
+    if parts:
+        write("".join(parts))
+
+
 def __from_json(
     cls: T,
-    data: str | dict[str, any],
+    data: JSONData | dict[str, any],
     *,
     decoder: JSONDecoder = default_decoder(),
     key_demangler: Callable[[str], str] = camel_to_snake,
+    lazy: bool = False,
+    only: Iterable[str] = None,
     **kwargs,
 ) -> T:
     if not is_object(cls):
         raise Exception("cannot decode non Object class from json")
+    if lazy and only is not None:
+        raise Exception("lazy decoding cannot be combined with a projection")
 
     # TODO: this is a classmethod, meaning that it can also be called on an instance object; what do we do when that happens?
 
-    if isinstance(data, str):
-        data = decoder.decode(data, **kwargs)
+    data = __parse_data(data, decoder, **kwargs)
 
-    f = getattr(cls, __OBJECT_FIELDS)
-    key_maps = getattr(cls, __OBJECT_KEY_MAPS, {})
+    # a lazy Object keeps the parsed data around and only converts and type checks a field once it is accessed
+    if lazy:
+        return __get_lazy_decoder(cls)(data, key_demangler)
+    # a projection only decodes the fields in `only`, every other field is given its default value
+    elif only is not None:
+        return __get_projected_decoder(cls, only)(data, key_demangler)
 
-    args: dict[str, str] = {}
-    for key, value in data.items():
-        key = key_maps.get(key, key_demangler(key))
+    return __get_decoder(cls)(data, key_demangler)
 
-        field = f.get(key, None)
-        if field is None:
-            continue
-        elif value is None:
-            # TODO: NOTE: hmm perhaps this check should be outside this dict? so if the key wasn't in the given data
-            # ^ then we should check it. because if the key was in data and value is None/null, then shouldn't that
-            # ^ override the default value, compared to if None/null wasn't provided in the data. to clarify: if `data`
-            # ^ contains "key" with value of "None" then the field should be set to "None". if `data` on the other hand
-            # ^ did not contain "key" then the "key" field should become ("key").default_value
-            if not field.initialized:
-                args[key] = "None"
-            else:
-                args[key] = str(field.default_value)
-            continue
-        # TODO: do type checking on containers; fx list[int] -> all elements should be int
-        if is_container(field.field_type):
-            sub_types: tuple[type] = field.field_type.__args__
-            if not isinstance(value, (list, dict)):
-                raise Exception()
-            if isinstance(value, list):
-                final: list[any] = []
-                if len(sub_types) == 1:
-                    typ: type = sub_types[0]
-                    for val in value:
-                        if is_object(typ):
-                            final.append(typ.from_json(val))
-                else:
-                    print("fuck")
-
-                print(final)
-                value = str(final)
-            elif isinstance(value, dict):
-                if len(sub_types) != 2:
-                    raise Exception()
-                key_type, value_type = sub_types[0], sub_types[1]
-                value = {__from_json(key_type, k): __from_json(value_type, v) for k, v in value.items()}
-            else:
-                raise Exception()
-        elif not any_type_of(value, field.field_type):
-            raise Exception(
-                "%s Object field '%s' must be of type '%s'"
-                % (getattr(cls, __OBJECT_NAME), key, __get_type_repr(field.field_type))
-            )
-        if field.field_type is str:
-            value = '"%s"' % str(value)
-        elif is_object(field.field_type):
-            value = "%s.from_json(%s)" % (field.field_type, str(value))
-        args[key] = str(value)
-
-    instantiate_call = "res = OBJECT({args})".format(
-        args=", ".join([f"{key}={value}" for key, value in args.items()])
-    )
 
-    namespace = dict(__name__="object_%s_from_json" % cls.__name__)
-    namespace["OBJECT"] = cls
-    exec(instantiate_call, namespace)
-    return namespace["res"]
+def __from_json_many(
+    cls: T,
+    data: JSONData | list[dict[str, any]],
+    *,
+    decoder: JSONDecoder = default_decoder(),
+    key_demangler: Callable[[str], str] = camel_to_snake,
+    only: Iterable[str] = None,
+    **kwargs,
+) -> list[T]:
+    if not is_object(cls):
+        raise Exception("cannot decode non Object class from json")
+
+    data = __parse_data(data, decoder, **kwargs)
+    if not isinstance(data, list):
+        raise Exception("%s Object records must be decoded from a json array" % getattr(cls, __OBJECT_NAME))
+
+    decode = __get_decoder(cls) if only is None else __get_projected_decoder(cls, only)
+    return [decode(record, key_demangler) for record in data]
+
+
+def __iter_json(
+    cls: T,
+    src: str | os.PathLike | IO,
+    *,
+    key_demangler: Callable[[str], str] = camel_to_snake,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[T]:
+    if not is_object(cls):
+        raise Exception("cannot decode non Object class from json")
+
+    decode = __get_decoder(cls)
+    for record in iter_json(src, chunk_size=chunk_size):
+        yield decode(record, key_demangler)
+
+
+def __decode_line(cls: T, decoder: JSONDecoder, key_demangler: Callable[[str], str], line: bytes) -> T:
+    return __get_decoder(cls)(decoder.decode(line), key_demangler)
+
+
+async def __aiter_json(
+    cls: T,
+    reader: asyncio.StreamReader,
+    *,
+    decoder: JSONDecoder = default_decoder(),
+    key_demangler: Callable[[str], str] = camel_to_snake,
+    offload_size: int = 256 * 1024,
+    executor: Any = None,
+) -> AsyncIterator[T]:
+    if not is_object(cls):
+        raise Exception("cannot decode non Object class from json")
+
+    # every line is parsed and turned into an Object in one go, so big lines are decoded entirely in the executor.
+    # the line decoder can be pickled, so it can be run by a `ProcessPoolExecutor` as long as the class, `decoder` and
+    # `key_demangler` are importable by its workers
+    line_decoder = JSONDecoder(functools.partial(__decode_line, cls, decoder, key_demangler))
+    async for obj in aiter_json(reader, decoder=line_decoder, offload_size=offload_size, executor=executor):
+        yield obj
+
+
+# a candidate boundary between two records of a json array. it may also match inside a string or a nested array,
+# which the decoding of the chunks on either side of it catches
+__RECORD_BOUNDARY = re.compile(rb"}\s*,\s*{")
+
+
+def __split_records(data: bytes | mmap.mmap, start: int, end: int, chunk_size: int, array: bool) -> list[tuple[int, int]]:
+    ranges: list[tuple[int, int]] = []
+    while end - start > chunk_size:
+        if array:
+            match = __RECORD_BOUNDARY.search(data, start + chunk_size, end)
+            if match is None:
+                break
+            ranges.append((start, match.start() + 1))
+            start = match.end() - 1
+        else:
+            pos = data.find(b"\n", start + chunk_size, end)
+            if pos == -1:
+                break
+            ranges.append((start, pos))
+            start = pos + 1
+    ranges.append((start, end))
+
+    return ranges
+
+
+def __decode_records(
+    cls: T,
+    src: str | os.PathLike | bytes,
+    start: int,
+    end: int,
+    array: bool,
+    decoder: JSONDecoder,
+    key_demangler: Callable[[str], str],
+) -> list[T]:
+    if isinstance(src, (str, os.PathLike)):
+        with open(src, "rb") as fp:
+            fp.seek(start)
+            chunk = fp.read(end - start)
+    else:
+        chunk = src[start:end]
+
+    if array:
+        records = decoder.decode(b"[" + chunk + b"]")
+    else:
+        records = [decoder.decode(line) for line in chunk.splitlines() if line.strip()]
+
+    decode = __get_decoder(cls)
+    return [decode(record, key_demangler) for record in records]
+
+
+def __from_json_parallel(
+    cls: T,
+    src: str | os.PathLike | bytes | bytearray | memoryview,
+    *,
+    workers: int = None,
+    decoder: JSONDecoder = default_decoder(),
+    key_demangler: Callable[[str], str] = camel_to_snake,
+    chunk_size: int = 16 * 1024 * 1024,
+) -> list[T]:
+    if not is_object(cls):
+        raise Exception("cannot decode non Object class from json")
+
+    # the source is split into chunks of whole records, either of a top-level json array or of NDJSON lines, which
+    # are decoded by a pool of worker processes. workers read their chunk of a file themselves, and send the decoded
+    # Objects back pickled, so the class and `key_demangler` must be importable by the workers
+    with contextlib.ExitStack() as stack:
+        if isinstance(src, (str, os.PathLike)):
+            fp = stack.enter_context(open(src, "rb"))
+            if os.fstat(fp.fileno()).st_size == 0:
+                return []
+            data = stack.enter_context(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            src = data = bytes(src)
+
+        start, end = 0, len(data)
+        while start < end and data[start:start + 1].isspace():
+            start += 1
+        while end > start and data[end - 1:end].isspace():
+            end -= 1
+        if start == end:
+            return []
+
+        array = data[start:start + 1] == b"["
+        if array:
+            if data[end - 1:end] != b"]":
+                raise Exception("%s Object records must be decoded from a json array" % getattr(cls, __OBJECT_NAME))
+            start, end = start + 1, end - 1
+
+        ranges = __split_records(data, start, end, chunk_size, array)
+
+    if workers == 1 or len(ranges) == 1:
+        return __decode_records(cls, src, ranges[0][0], ranges[-1][1], array, decoder, key_demangler)
+
+    def submit(start: int, end: int) -> Future:
+        if isinstance(src, (str, os.PathLike)):
+            return executor.submit(__decode_records, cls, src, start, end, array, decoder, key_demangler)
+        return executor.submit(__decode_records, cls, src[start:end], 0, end - start, array, decoder, key_demangler)
+
+    res: list[T] = []
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [submit(start, end) for start, end in ranges]
+        for i, future in enumerate(futures):
+            try:
+                res += future.result()
+            except ValueError:
+                # a boundary guessed inside a string or a nested array leaves the chunks on both sides of it invalid,
+                # so the chunk is merged into the next one. a chunk can only be valid if its boundaries are correct
+                if not array or i + 1 == len(ranges):
+                    raise
+                futures[i + 1].cancel()
+                ranges[i + 1] = (ranges[i][0], ranges[i + 1][1])
+                futures[i + 1] = submit(*ranges[i + 1])
+
+    return res
 
 
 def __to_dict(
-    self: T, *, skip_null: bool = False, use_default_value: bool = False
+    self: T, *, skip_null: bool = False, use_default_value: bool = False, changed_only: bool = False
 ) -> dict[str, any]:
     if not is_object(self):
         raise Exception("cannot turn non Object class into dict")
 
-    d = {}
-    for key, field in getattr(self, __OBJECT_FIELDS).items():
-        val = getattr(self, field.name, None)
-        if val is None:
-            if skip_null:
-                continue
-            elif use_default_value:
-                val = field.default_value
-        if any_type_of(val, set):
-            val = list(val)
-        d[key] = val
+    if changed_only:
+        return __encode_changes(self, skip_null, use_default_value)
+
+    return self.__object_encoder__(skip_null, use_default_value)
+
+
+def __encode_changes(self: T, skip_null: bool, use_default_value: bool) -> dict[str, any]:
+    encode = getattr(self, __OBJECT_DELTA_ENCODER, None)
+    if encode is None:
+        raise Exception("%s Object does not track changes" % getattr(self, __OBJECT_NAME))
+
+    return encode(skip_null, use_default_value)
+
+
+def __mark_clean(self: T):
+    if not getattr(self, __OBJECT_TRACK_CHANGES, False):
+        raise Exception("%s Object does not track changes" % getattr(self, __OBJECT_NAME))
+
+    object.__setattr__(self, __OBJECT_CHANGES, None)
 
-    return d
+
+def __encode_value(value: any, skip_null: bool, use_default_value: bool) -> any:
+    # generic fallback used by the generated encoders for values whose declared type does not tell us enough
+    if is_object(value):
+        return value.__object_encoder__(skip_null, use_default_value)
+    elif isinstance(value, (list, set)):
+        return [__encode_value(v, skip_null, use_default_value) for v in value]
+    elif isinstance(value, tuple):
+        return tuple(__encode_value(v, skip_null, use_default_value) for v in value)
+    elif isinstance(value, dict):
+        return {k: __encode_value(v, skip_null, use_default_value) for k, v in value.items()}
+
+    return value
+
+
+def __is_plain_type(t: type) -> bool:
+    # plain types are the ones `json` can encode as they are, so their values can be passed straight through
+    if isinstance(t, GenericAlias):
+        return t.__origin__ in (list, tuple, dict) and all(__is_plain_type(arg) for arg in t.__args__)
+
+    return t in (int, float, str, bool, list, tuple, dict)
+
+
+def __get_sub_object(t: type, origin: type) -> T | None:
+    # finds the Object type `t` holds if `t` is either `origin[Object]` or `origin[str, Object]`
+    if not isinstance(t, GenericAlias) or t.__origin__ is not origin:
+        return None
+    if origin is list and len(t.__args__) == 1 and is_object(t.__args__[0]):
+        return t.__args__[0]
+    if origin is dict and len(t.__args__) == 2 and t.__args__[0] is str and is_object(t.__args__[1]):
+        return t.__args__[1]
+
+    return None
+
+
+def __make_field_load(i: int, field: ObjectField, variant: str | None) -> list[str]:
+    # generates the code loading the value of a field into `v`. for lazy Objects the raw json value of untouched
+    # plain fields is used as it is, while `None` and missing values go through the field for their defaults. for
+    # copy-on-write clones the shared value of untouched fields is used without copying it
+    if variant == "lazy" and __is_plain_type(field.field_type):
+        return [
+            f"v = self.__dict__.get({field.name!r}, MISSING)",
+            "if v is MISSING:",
+            f"    v = self.__dict__[LAZY_DATA][0].get({field.name!r})",
+            "    if v is None:",
+            f"        v = self.{field.name}",
+        ]
+    elif variant == "cow" and __is_cow_type(field.field_type):
+        return [
+            f"v = self.__dict__.get({field.name!r}, MISSING)",
+            "if v is MISSING:",
+            f"    v = self.__dict__[COW_DATA][{field.name!r}]",
+        ]
+
+    return [f"v = self.{field.name}"]
+
+
+def __make_encoder(cls: T, variant: str | None = None, changed_only: bool = False) -> Callable:
+    if not is_object(cls):
+        raise Exception("cannot make encoder for non Object class")
+
+    namespace = dict(__name__="object_%s_encoder" % cls.__name__)
+    namespace["ENCODE_VALUE"] = __encode_value
+    namespace["MISSING"] = __MISSING
+    namespace["LAZY_DATA"] = __OBJECT_LAZY_DATA
+    namespace["COW_DATA"] = __OBJECT_COW_DATA
+    namespace["CHANGES"] = __OBJECT_CHANGES
+
+    conversions: list[str] = []
+    if changed_only:
+        # only the fields assigned since the Object was made, or since it was last marked clean, are encoded
+        conversions.append("    changes = getattr(self, CHANGES, None) or ()")
+    for i, field in enumerate(fields(cls)):
+        t = field.field_type
+        namespace[f"DEFAULT_{i}"] = field.default_value
+        if is_object(t):
+            value = "v.__object_encoder__(skip_null, use_default_value)"
+        elif __get_sub_object(t, list) is not None:
+            value = "[None if x is None else x.__object_encoder__(skip_null, use_default_value) for x in v]"
+        elif __get_sub_object(t, dict) is not None:
+            value = (
+                "{k: None if x is None else x.__object_encoder__(skip_null, use_default_value) for k, x in v.items()}"
+            )
+        elif __is_plain_type(t):
+            value = "v"
+        else:
+            value = "ENCODE_VALUE(v, skip_null, use_default_value)"
+
+        lines = __make_field_load(i, field, variant) + [
+            "if v is None:",
+            "    if not skip_null:",
+            f"        d[{field.name!r}] = ENCODE_VALUE(DEFAULT_{i}, skip_null, use_default_value) if use_default_value else None",
+            "else:",
+            f"    d[{field.name!r}] = {value}",
+        ]
+        if changed_only:
+            lines = [f"if {field.name!r} in changes:"] + [f"    {line}" for line in lines]
+        conversions.append("\n".join(f"    {line}" for line in lines))
+
+    encoder_def = __OBJECT_ENCODER_TEMPLATE.format(conversions="\n".join(conversions))
+
+    exec(encoder_def, namespace)
+    return namespace["__encode"]
+
+
+def __encode_key(key: any) -> str:
+    # `json` writes int, float, bool and None keys as strings of their json value, and rejects any other key
+    if key is None or isinstance(key, (int, float)):
+        return encode_basestring_ascii(json.dumps(key))
+
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def __make_json_writer(cls: T, variant: str | None = None) -> Callable:
+    if not is_object(cls):
+        raise Exception("cannot make json writer for non Object class")
+
+    namespace = dict(__name__="object_%s_json_writer" % cls.__name__)
+    namespace["ENCODE_VALUE"] = __encode_value
+    namespace["MISSING"] = __MISSING
+    namespace["LAZY_DATA"] = __OBJECT_LAZY_DATA
+    namespace["COW_DATA"] = __OBJECT_COW_DATA
+    namespace["ENCODE_STR"] = encode_basestring_ascii
+    namespace["INT_REPR"] = int.__repr__
+    namespace["FLOAT_REPR"] = float.__repr__
+    namespace["DUMPS"] = json.dumps
+    namespace["ENCODE_KEY"] = __encode_key
+
+    f: list[ObjectField] = fields(cls)
+    keys: list[str] = [json.dumps(field.name) + ": " for field in f]
+    namespace["KEYS"] = tuple(keys)
+    namespace["TEMPLATE"] = "{" + ", ".join(key + "%s" for key in keys) + "}"
+
+    conversions: list[str] = []
+    for i, field in enumerate(f):
+        t = field.field_type
+        namespace[f"DEFAULT_{i}"] = json.dumps(__encode_value(field.default_value, False, False))
+        if t is str:
+            value = "ENCODE_STR(v) if type(v) is str else DUMPS(v)"
+        elif t is int:
+            value = "INT_REPR(v) if type(v) is int else DUMPS(v)"
+        elif t is float:
+            # `v - v` is only 0.0 for finite floats; `json` writes inf and nan in its own way
+            value = "FLOAT_REPR(v) if type(v) is float and v - v == 0.0 else DUMPS(v)"
+        elif t is bool:
+            value = '"true" if v is True else "false" if v is False else DUMPS(v)'
+        elif is_object(t):
+            value = "v.__object_json_writer__(skip_null, use_default_value)"
+        elif __get_sub_object(t, list) is not None:
+            value = (
+                '"[" + ", ".join(["null" if x is None else x.__object_json_writer__(skip_null, use_default_value) '
+                'for x in v]) + "]"'
+            )
+        elif __get_sub_object(t, dict) is not None:
+            value = (
+                '"{" + ", ".join([(ENCODE_STR(k) if type(k) is str else ENCODE_KEY(k)) + ": " + '
+                '("null" if x is None else x.__object_json_writer__(skip_null, use_default_value)) '
+                'for k, x in v.items()]) + "}"'
+            )
+        elif __is_plain_type(t):
+            value = "DUMPS(v)"
+        else:
+            value = "DUMPS(ENCODE_VALUE(v, skip_null, use_default_value))"
+
+        conversions.append(
+            "\n".join(
+                f"    {line}"
+                for line in __make_field_load(i, field, variant)
+                + [
+                    "if v is None:",
+                    f'    j{i} = None if skip_null else DEFAULT_{i} if use_default_value else "null"',
+                    "else:",
+                    f"    j{i} = {value}",
+                ]
+            )
+        )
+
+    writer_def = __OBJECT_JSON_WRITER_TEMPLATE.format(
+        conversions="\n".join(conversions),
+        values="".join(f"j{i}, " for i in range(len(f))),
+    )
+
+    exec(writer_def, namespace)
+    return namespace["__write"]
 
 
 def __copy_from(self: T, other: T):
@@ -227,23 +873,58 @@ def __copy_from(self: T, other: T):
         setattr(self, field.name, field.get_value(other))
 
 
-def __of(other: T):
+def __of(other: T, *, cow: bool = False, deep: bool = False):
+    """makes a clone of an Object instance
+
+    a copy-on-write clone shares the lists, tuples, sets and dicts of `other` until it first accesses them, and only
+    then copies them. `other` must therefore not be changed in place, fx. by appending to one of its lists, while
+    copy-on-write clones of it exist, as the clones would see the change. assigning new values to the fields of
+    `other` is safe
+
+    Args:
+        other (T): the Object instance to clone
+        cow (bool): whether to make a copy-on-write clone
+        deep (bool): whether to make a deep clone, copying all nested containers and Objects
+
+    Returns:
+        T: the clone
+    """
+
     if not is_object(other):
         raise Exception("cannot copy from non Object class")
+    if cow and deep:
+        raise Exception("cannot make a clone that is both copy-on-write and deep")
 
-    t = type(other)()
-    __copy_from(t, other)
-    return t
+    shallow, copy_on_write, deep_copy = __get_cloner(type(other))
+    if cow:
+        return copy_on_write(other)
+    elif deep:
+        return deep_copy(other)
 
+    return shallow(other)
 
-def __load_json(self: T, data: str | dict[str, any], *, decoder: JSONDecoder = default_decoder(), **kwargs):
+
+def __load_json(
+    self: T,
+    data: JSONData | dict[str, any],
+    *,
+    decoder: JSONDecoder = default_decoder(),
+    only: Iterable[str] = None,
+    **kwargs,
+):
     if not is_object(self):
         raise Exception("cannot decode non Object class from json")
 
-    if isinstance(data, str):
-        data = decoder.decode(data, **kwargs)
+    data = __parse_data(data, decoder, **kwargs)
 
     f: list[ObjectField] = getattr(self, __OBJECT_FIELDS)
+    # a projection leaves every field outside of it untouched
+    if only is not None:
+        only = frozenset(only)
+        for name in only:
+            if name not in f:
+                raise Exception("%s Object has no field '%s' to project" % (getattr(self, __OBJECT_NAME), name))
+        f = {name: field for name, field in f.items() if name in only}
 
     args: dict[str, str] = {}
     for key, value in data.items():
@@ -270,6 +951,17 @@ def __load_json(self: T, data: str | dict[str, any], *, decoder: JSONDecoder = d
         setattr(self, field.name, value)
 
 
+def __get_init_defaults(cls: T) -> dict[str, any]:
+    defaults: dict[str, any] = {}
+    for field in fields(cls):
+        if field.field_type is str or field.default_value:
+            defaults[field.name] = field.default_value
+        else:
+            defaults[field.name] = None
+
+    return defaults
+
+
 def __make_constructor(cls: T) -> Callable:
     if not is_object(cls):
         raise Exception("cannot make constructor for non Object class")
@@ -278,18 +970,1143 @@ def __make_constructor(cls: T) -> Callable:
 
     init_def = __OBJECT_INIT_TEMPLATE.format(
         args=", ".join(
-            [f"{field.name}: {__get_type_repr(field.field_type)} = {f'"{field.default_value}"' if field.field_type == str else field.default_value if field.default_value else "None"}" for field in f]
+            [f"{field.name}: {__get_type_repr(field.field_type)} = DEFAULT_{i}" for i, field in enumerate(f)]
         ),
-        assignments="\n".join([f"\tself.{field.name} = {field.name}" for field in f]),
+        assignments="\n".join([f"\t{__make_assignment(cls, 'self', field.name, field.name)}" for field in f]) or "\tpass",
     )
 
-    print(init_def)
-
     namespace = dict(__name__="object_%s_init" % cls.__name__)
+    namespace["SETATTR"] = object.__setattr__
+    for i, default in enumerate(__get_init_defaults(cls).values()):
+        namespace[f"DEFAULT_{i}"] = default
     exec(init_def, namespace)
     return namespace["__init__"]
 
 
+def __make_assignment(cls: T, target: str, name: str, value: str) -> str:
+    # frozen Objects and Objects which track changes have their own `__setattr__`, which generated code goes around
+    # when it fills in a new instance. `SETATTR` must be `object.__setattr__` in the namespace of such code
+    if getattr(cls, __OBJECT_TRACK_CHANGES, False) or getattr(cls, __OBJECT_FROZEN, False):
+        return f"SETATTR({target}, {name!r}, {value})"
+
+    return f"{target}.{name} = {value}"
+
+
+def __make_tracker(cls: T) -> Callable:
+    if not is_object(cls):
+        raise Exception("cannot make change tracker for non Object class")
+
+    namespace = dict(__name__="object_%s_tracker" % cls.__name__)
+    namespace["SETATTR"] = object.__setattr__
+    namespace["GETATTR"] = getattr
+    namespace["CHANGES"] = __OBJECT_CHANGES
+    namespace["FIELDS"] = frozenset(field.name for field in fields(cls))
+    exec(__OBJECT_TRACKER_TEMPLATE, namespace)
+    return namespace["__setattr__"]
+
+
+def __make_equality(cls: T, unsafe_hash: bool = False) -> tuple[Callable, Callable | None]:
+    if not is_object(cls):
+        raise Exception("cannot make equality for non Object class")
+
+    f: list[ObjectField] = fields(cls)
+    equality_def = __OBJECT_EQ_TEMPLATE.format(
+        values="".join(f"self.{field.name}, " for field in f),
+        other_values="".join(f"other.{field.name}, " for field in f),
+    )
+
+    namespace = dict(__name__="object_%s_equality" % cls.__name__)
+    namespace["OBJECT"] = cls
+    namespace["GETATTR"] = getattr
+    namespace["SETATTR"] = object.__setattr__
+    namespace["HASH"] = __OBJECT_HASH
+    exec(equality_def, namespace)
+
+    # the hash of a frozen Object can't change, so it is only computed once. mutable Objects are unhashable, like
+    # mutable dataclasses, as assigning a field would change the hash of an instance already in a set or dict
+    if getattr(cls, __OBJECT_FROZEN, False):
+        return namespace["__eq__"], namespace["__cached_hash__"]
+    elif unsafe_hash:
+        return namespace["__eq__"], namespace["__hash__"]
+
+    return namespace["__eq__"], None
+
+
+def __make_frozen_setattr(cls: T) -> tuple[Callable, Callable]:
+    if not is_object(cls):
+        raise Exception("cannot make frozen setattr for non Object class")
+
+    namespace = dict(__name__="object_%s_frozen" % cls.__name__)
+    namespace["ERROR"] = "cannot assign to field '%%s' of frozen %s Object" % getattr(cls, __OBJECT_NAME)
+    exec(__OBJECT_FROZEN_TEMPLATE, namespace)
+    return namespace["__setattr__"], namespace["__delattr__"]
+
+
+def __make_reduce(cls: T) -> Callable:
+    if not is_object(cls):
+        raise Exception("cannot make reduce for non Object class")
+
+    # instances are pickled as the class and the positional arguments of its constructor, so no field names are
+    # stored per instance. instances of the lazy and copy-on-write variants are pickled as the Object class itself
+    reduce_def = __OBJECT_REDUCE_TEMPLATE.format(
+        values="".join(f"self.{field.name}, " for field in fields(cls)),
+    )
+
+    namespace = dict(__name__="object_%s_reduce" % cls.__name__)
+    namespace["OBJECT"] = cls
+    exec(reduce_def, namespace)
+    return namespace["__reduce__"]
+
+
+class __KeyTable(dict):
+    """maps every accepted json key of an Object class to the name of its field, or to `None` for keys which aren't
+    fields. keys missing from the table are demangled once and memoized, until the table has memoized too many"""
+
+    __slots__ = ("field_names", "key_demangler", "free")
+
+    def __init__(self, field_names: set[str], key_demangler: Callable[[str], str], free: int):
+        super().__init__()
+        self.field_names = field_names
+        self.key_demangler = key_demangler
+        self.free = free
+
+    def __missing__(self, key: str) -> str | None:
+        name = self.key_demangler(key)
+        if name not in self.field_names:
+            name = None
+
+        if self.free > 0:
+            self.free -= 1
+            self[key] = name
+
+        return name
+
+
+def __get_key_tables(cls: T) -> dict[Callable, dict[str, str | None]]:
+    tables = cls.__dict__.get(__OBJECT_KEY_TABLES, None)
+    if tables is None:
+        tables = {}
+        setattr(cls, __OBJECT_KEY_TABLES, tables)
+
+    return tables
+
+
+def __make_key_table(
+    cls: T,
+    key_demangler: Callable[[str], str],
+    tables: dict[Callable, dict[str, str | None]],
+    only: frozenset[str] | None = None,
+) -> dict[str, str | None]:
+    # the keys of fields outside the projection `only` map to `None` up front, so they are never demangled
+    field_names: set[str] = {field.name for field in fields(cls)}
+    projected: set[str] = field_names if only is None else field_names & only
+
+    table = __KeyTable(projected, key_demangler, __KEY_TABLE_CACHE_SIZE)
+    for name in field_names:
+        value = name if name in projected else None
+        table[name] = value
+        for key in (snake_to_lower_camel(name), snake_to_camel(name)):
+            if key_demangler(key) == name:
+                table[key] = value
+    for key, name in getattr(cls, __OBJECT_KEY_MAPS, {}).items():
+        table[key] = name if name in projected else None
+
+    if len(tables) >= __KEY_TABLES_MAX:
+        tables.clear()
+    tables[key_demangler] = table
+
+    return table
+
+
+def __make_decoder_namespace(cls: T, kind: str, only: frozenset[str] | None = None) -> dict[str, any]:
+    namespace = dict(__name__="object_%s_%s" % (cls.__name__, kind))
+    namespace["MISSING"] = __MISSING
+    # projected decoders have key tables of their own
+    tables = __get_key_tables(cls) if only is None else {}
+    namespace["KEY_TABLES"] = tables
+    namespace["MAKE_KEY_TABLE"] = lambda key_demangler: __make_key_table(cls, key_demangler, tables, only)
+    namespace["LAZY_DATA"] = __OBJECT_LAZY_DATA
+    namespace["any_type_of"] = any_type_of
+    namespace["GET_DECODER"] = __get_decoder
+    namespace["DECODE_NESTED"] = __decode_nested
+    namespace["INTERNED"] = getattr(cls, __OBJECT_INTERNED, set())
+    namespace["POOL"] = getattr(cls, __OBJECT_STRING_POOL, {})
+    namespace["POOL_SIZE"] = getattr(cls, __OBJECT_STRING_POOL_SIZE, 0)
+
+    name = getattr(cls, __OBJECT_NAME)
+    defaults = __get_init_defaults(cls)
+    for i, field in enumerate(fields(cls)):
+        namespace[f"DEFAULT_{i}"] = defaults[field.name]
+        namespace[f"NULL_{i}"] = field.default_value if field.initialized else None
+        namespace[f"TYPE_{i}"] = field.field_type
+        namespace[f"ERROR_{i}"] = "%s Object field '%s' must be of type '%s'" % (
+            name,
+            field.name,
+            __get_type_repr(field.field_type),
+        )
+
+    return namespace
+
+
+def __decode_nested(cls: T, value: any, key_demangler: Callable[[str], str]) -> T:
+    # decodes an Object held by a container field straight from its parsed json object
+    if type(value) is dict:
+        return __get_decoder(cls)(value, key_demangler)
+    elif value is None or isinstance(value, cls):
+        return value
+
+    raise Exception("%s Object cannot be decoded from '%s'" % (getattr(cls, __OBJECT_NAME), type(value).__name__))
+
+
+def __make_value_conversion(t: type, value: str, key: str, namespace: dict[str, any], intern: bool) -> str | None:
+    # generates an expression turning the parsed json `value` into a value of type `t`, recursing into the types
+    # held by containers. `None` is returned if the json value can be used as it is
+    args: tuple = getattr(t, "__args__", ())
+    origin = getattr(t, "__origin__", t)
+    if is_object(t):
+        namespace[f"SUB_{key}"] = t
+        return f"DECODE_NESTED(SUB_{key}, {value}, key_demangler)"
+    elif t is str and intern:
+        return f"({__INTERN_EXPRESSION.format(value=value)} if type({value}) is str else {value})"
+    elif origin is dict:
+        item = __make_value_conversion(args[1], f"x{key}", f"{key}_0", namespace, intern) if len(args) == 2 else None
+        if item is None:
+            return None
+        return f"{{k{key}: {item} for k{key}, x{key} in {value}.items()}}"
+    elif origin in (list, tuple, set):
+        # only homogeneous tuples, fx. `tuple[int, ...]`, have their items converted
+        homogeneous = len(args) == 1 or (len(args) == 2 and args[1] is Ellipsis)
+        item = __make_value_conversion(args[0], f"x{key}", f"{key}_0", namespace, intern) if homogeneous else None
+        if origin is list:
+            return f"[{item} for x{key} in {value}]" if item is not None else None
+        elif origin is set:
+            return f"{{{item} for x{key} in {value}}}" if item is not None else f"set({value})"
+        return f"tuple([{item} for x{key} in {value}])" if item is not None else f"tuple({value})"
+
+    return None
+
+
+def __make_field_conversion(i: int, field: ObjectField, namespace: dict[str, any]) -> str:
+    # generates the code which takes the raw json value of a field out of `found` and turns it into the value of
+    # the field in `v{i}`
+    conversion = [
+        f"v{i} = found.get({field.name!r}, MISSING)",
+        f"if v{i} is MISSING:",
+        f"    v{i} = DEFAULT_{i}",
+        f"elif v{i} is None:",
+        f"    v{i} = NULL_{i}",
+    ]
+    if is_container(field.field_type):
+        # json only has arrays and objects, so list, tuple and set fields are decoded from arrays and dict fields
+        # from objects. values which already are of the field's container type are taken as they are
+        origin = getattr(field.field_type, "__origin__", field.field_type)
+        json_type = "dict" if origin is dict else "list"
+        namespace[f"ORIGIN_{i}"] = origin
+        conversion += [
+            f"elif not isinstance(v{i}, ({json_type}, ORIGIN_{i})):",
+            f"    raise Exception(ERROR_{i})",
+        ]
+        # TODO: do type checking on containers; fx list[int] -> all elements should be int
+        expression = __make_value_conversion(
+            field.field_type, f"v{i}", f"{i}", namespace, field.name in namespace["INTERNED"]
+        )
+        if expression is not None:
+            conversion += [
+                f"elif type(v{i}) is {json_type}:",
+                f"    v{i} = {expression}",
+            ]
+    elif is_object(field.field_type):
+        conversion += [
+            f"elif type(v{i}) is dict:",
+            f"    v{i} = GET_DECODER(TYPE_{i})(v{i}, key_demangler)",
+            f"elif not isinstance(v{i}, TYPE_{i}):",
+            f"    raise Exception(ERROR_{i})",
+        ]
+    elif field.field_type in (int, float, str, bool):
+        conversion += [
+            f"elif type(v{i}) is not TYPE_{i}:",
+            f"    raise Exception(ERROR_{i})",
+        ]
+        if field.field_type is str and field.name in namespace["INTERNED"]:
+            conversion += [
+                "else:",
+                f"    v{i} = {__INTERN_EXPRESSION.format(value=f'v{i}')}",
+            ]
+    else:
+        conversion += [
+            f"elif not any_type_of(v{i}, TYPE_{i}):",
+            f"    raise Exception(ERROR_{i})",
+        ]
+
+    return "\n".join(f"    {line}" for line in conversion)
+
+
+def __make_decoder(cls: T, only: frozenset[str] | None = None) -> Callable:
+    if not is_object(cls):
+        raise Exception("cannot make decoder for non Object class")
+
+    namespace = __make_decoder_namespace(cls, "decoder", only)
+    namespace["OBJECT"] = cls
+
+    # fields outside the projection `only` are never looked at, and are given their default value
+    f: list[ObjectField] = fields(cls)
+    args = ", ".join(f"v{i}" for i in range(len(f)))
+    decoded = [i for i, field in enumerate(f) if only is None or field.name in only]
+    result = f"    return OBJECT({args})"
+
+    key = getattr(cls, __OBJECT_KEY, None)
+    keys = [i for i in decoded if f[i].name == key]
+    if keys:
+        # only the decoded fields of an instance in the identity map are updated
+        namespace["IDENTITIES"] = cls.identity_map
+        if getattr(cls, __OBJECT_FROZEN, False):
+            # the replacement keeps the values of the fields outside the projection from the mapped instance
+            replacement = ", ".join(f"v{i}" if i in decoded else f"res.{field.name}" for i, field in enumerate(f))
+            updates = [
+                f"    if ({''.join(f'res.{f[i].name}, ' for i in decoded)}) != ({''.join(f'v{i}, ' for i in decoded)}):",
+                f"        return IDENTITIES.put(v{keys[0]}, OBJECT({replacement}))",
+            ]
+        elif getattr(cls, __OBJECT_TRACK_CHANGES, False):
+            # only fields whose value differs are assigned, so only those are recorded as changed
+            updates = [
+                line for i in decoded for line in (
+                    f"    if res.{f[i].name} != v{i}:",
+                    f"        res.{f[i].name} = v{i}",
+                )
+            ]
+        else:
+            updates = [f"    res.{f[i].name} = v{i}" for i in decoded]
+        result = __OBJECT_IDENTITY_TEMPLATE.format(
+            key=keys[0], name=f[keys[0]].name, args=args, updates="\n".join(updates)
+        )
+
+    decoder_def = __OBJECT_DECODER_TEMPLATE.format(
+        find=__OBJECT_FIND_FIELDS,
+        conversions="\n".join(
+            __make_field_conversion(i, field, namespace) if i in decoded else f"    v{i} = DEFAULT_{i}"
+            for i, field in enumerate(f)
+        ),
+        result=result,
+    )
+
+    exec(decoder_def, namespace)
+    return namespace["__decode"]
+
+
+class IdentityMap(object):
+    """a bounded map of the instances of an Object class by the value of its key field, used by its decoders so data
+    about the same entity is decoded into the same instance. once full, the least recently used instance is evicted
+
+    Example:
+        @Object(key="id")
+        class User:
+            id: int
+
+        assert User.from_json('{"id": 1}') is User.from_json('{"id": 1}')
+        print(User.identity_map.hits, User.identity_map.misses)
+    """
+
+    __slots__ = ("max_size", "hits", "misses", "evictions", "_instances")
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._instances: OrderedDict[any, any] = OrderedDict()
+
+    def get(self, key: any) -> any:
+        """gets the instance with the given key, and marks it as the most recently used
+
+        Args:
+            key (any): the value of the key field
+
+        Returns:
+            any: the instance, or `None` if there is no instance with the key
+        """
+
+        instance = self._instances.get(key, None)
+        if instance is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._instances.move_to_end(key)
+        return instance
+
+    def put(self, key: any, instance: any) -> any:
+        """puts an instance into the map, evicting the least recently used instance if the map is full
+
+        Args:
+            key (any): the value of the key field
+            instance (any): the instance
+
+        Returns:
+            any: the instance
+        """
+
+        self._instances[key] = instance
+        self._instances.move_to_end(key)
+        if len(self._instances) > self.max_size:
+            self._instances.popitem(last=False)
+            self.evictions += 1
+
+        return instance
+
+    def clear(self):
+        """removes every instance from the map and resets the statistics"""
+
+        self._instances.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __contains__(self, key: any) -> bool:
+        return key in self._instances
+
+    def __repr__(self) -> str:
+        return "IdentityMap(size=%d, max_size=%d, hits=%d, misses=%d, evictions=%d)" % (
+            len(self), self.max_size, self.hits, self.misses, self.evictions
+        )
+
+
+class __LazyField(object):
+    """a non-data descriptor standing in for a field of a lazily decoded Object or a copy-on-write clone. the first
+    access produces the value of the field and stores it in the instance `__dict__`, which then shadows the
+    descriptor"""
+
+    __slots__ = ("convert",)
+
+    def __init__(self, convert: Callable[[T], any]):
+        self.convert = convert
+
+    def __get__(self, instance: T, owner: type) -> any:
+        if instance is None:
+            return self
+
+        return self.convert(instance)
+
+
+def __make_lazy_decoder(cls: T) -> Callable:
+    if not is_object(cls):
+        raise Exception("cannot make lazy decoder for non Object class")
+
+    namespace = __make_decoder_namespace(cls, "lazy_decoder")
+
+    f: list[ObjectField] = fields(cls)
+    lazy_def = "\n".join(
+        __OBJECT_LAZY_FIELD_TEMPLATE.format(
+            i=i, name=field.name, conversion=__make_field_conversion(i, field, namespace)
+        )
+        for i, field in enumerate(f)
+    )
+    lazy_def += "\n" + __OBJECT_LAZY_DECODER_TEMPLATE.format(find=__OBJECT_FIND_FIELDS)
+    exec(lazy_def, namespace)
+
+    # the lazy instances are of a subclass which has a descriptor in place of every field and encoders that pass
+    # the raw values of untouched fields straight through
+    attrs = {
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+        __OBJECT_VARIANT: True,
+        __OBJECT_ENCODER: __make_encoder(cls, variant="lazy"),
+        __OBJECT_JSON_WRITER: __make_json_writer(cls, variant="lazy"),
+    }
+    for i, field in enumerate(f):
+        attrs[field.name] = __LazyField(namespace[f"__convert_{i}"])
+    namespace["OBJECT"] = type(cls.__name__, (cls,), attrs)
+
+    return namespace["__decode"]
+
+
+def __get_decoder(cls: T) -> Callable:
+    # the decoder is generated the first time it is needed and cached on the class itself. `cls.__dict__` is used
+    # rather than `getattr` so that subclasses never pick up the decoder of their parent
+    decoder = cls.__dict__.get(__OBJECT_DECODER, None)
+    if decoder is None:
+        decoder = __make_decoder(cls)
+        setattr(cls, __OBJECT_DECODER, decoder)
+
+    return decoder
+
+
+def __get_projected_decoder(cls: T, only: Iterable[str]) -> Callable:
+    only = frozenset(only)
+    decoders = cls.__dict__.get(__OBJECT_PROJECTED_DECODERS, None)
+    if decoders is None:
+        decoders = {}
+        setattr(cls, __OBJECT_PROJECTED_DECODERS, decoders)
+
+    decoder = decoders.get(only, None)
+    if decoder is None:
+        field_names = {field.name for field in fields(cls)}
+        for name in only:
+            if name not in field_names:
+                raise Exception("%s Object has no field '%s' to project" % (getattr(cls, __OBJECT_NAME), name))
+
+        decoder = __make_decoder(cls, only)
+        if len(decoders) >= __KEY_TABLES_MAX:
+            decoders.clear()
+        decoders[only] = decoder
+
+    return decoder
+
+
+def __get_lazy_decoder(cls: T) -> Callable:
+    decoder = cls.__dict__.get(__OBJECT_LAZY_DECODER, None)
+    if decoder is None:
+        decoder = __make_lazy_decoder(cls)
+        setattr(cls, __OBJECT_LAZY_DECODER, decoder)
+
+    return decoder
+
+
+def __write_varint(n: int, out: bytearray):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def __read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    b = data[pos]
+    if b < 0x80:
+        return b, pos + 1
+
+    n, shift = 0, 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def __write_str(v: str, out: bytearray):
+    encoded = v.encode("utf-8")
+    __write_varint(len(encoded), out)
+    out += encoded
+
+
+def __read_str(data: bytes, pos: int) -> tuple[str, int]:
+    n, pos = __read_varint(data, pos)
+    return str(data[pos : pos + n], "utf-8"), pos + n
+
+
+# tags of the values written by the dynamic codec, which is used for values without a (supported) declared type
+__TAG_NONE, __TAG_FALSE, __TAG_TRUE, __TAG_INT, __TAG_FLOAT, __TAG_STR, __TAG_LIST, __TAG_DICT = range(8)
+__DOUBLE = struct.Struct("<d")
+
+
+def __write_dynamic(v: any, out: bytearray):
+    if v is None:
+        out.append(__TAG_NONE)
+    elif v is True or v is False:
+        out.append(__TAG_TRUE if v else __TAG_FALSE)
+    elif isinstance(v, int):
+        out.append(__TAG_INT)
+        __write_varint(v * 2 if v >= 0 else -v * 2 - 1, out)
+    elif isinstance(v, float):
+        out.append(__TAG_FLOAT)
+        out += __DOUBLE.pack(v)
+    elif isinstance(v, str):
+        out.append(__TAG_STR)
+        __write_str(v, out)
+    elif isinstance(v, (list, tuple, set)):
+        out.append(__TAG_LIST)
+        __write_varint(len(v), out)
+        for item in v:
+            __write_dynamic(item, out)
+    elif isinstance(v, dict):
+        out.append(__TAG_DICT)
+        __write_varint(len(v), out)
+        for key, item in v.items():
+            __write_dynamic(key, out)
+            __write_dynamic(item, out)
+    elif is_object(v):
+        __write_dynamic(v.to_dict(), out)
+    else:
+        raise Exception("cannot encode value of type '%s' to bytes" % type(v).__name__)
+
+
+def __read_dynamic(data: bytes, pos: int) -> tuple[any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == __TAG_NONE:
+        return None, pos
+    elif tag == __TAG_FALSE or tag == __TAG_TRUE:
+        return tag == __TAG_TRUE, pos
+    elif tag == __TAG_INT:
+        n, pos = __read_varint(data, pos)
+        return (n >> 1) if not n & 1 else -((n + 1) >> 1), pos
+    elif tag == __TAG_FLOAT:
+        return __DOUBLE.unpack_from(data, pos)[0], pos + 8
+    elif tag == __TAG_STR:
+        return __read_str(data, pos)
+    elif tag == __TAG_LIST:
+        n, pos = __read_varint(data, pos)
+        res = []
+        for _ in range(n):
+            item, pos = __read_dynamic(data, pos)
+            res.append(item)
+        return res, pos
+    elif tag == __TAG_DICT:
+        n, pos = __read_varint(data, pos)
+        res = {}
+        for _ in range(n):
+            key, pos = __read_dynamic(data, pos)
+            res[key], pos = __read_dynamic(data, pos)
+        return res, pos
+
+    raise Exception("invalid binary Object data")
+
+
+# struct formats of the types packed with a fixed size
+__FIXED_FORMATS = {int: "q", float: "d", bool: "?"}
+
+
+def __binary_schema(t: type) -> str:
+    # a description of everything the binary layout of `t` depends on, used for the schema fingerprint
+    if is_object(t):
+        return "%s{%s}" % (
+            getattr(t, __OBJECT_NAME),
+            ",".join("%s:%s" % (field.name, __binary_schema(field.field_type)) for field in fields(t)),
+        )
+    elif isinstance(t, GenericAlias):
+        return "%s[%s]" % (t.__origin__.__name__, ",".join(__binary_schema(arg) for arg in t.__args__))
+    elif isinstance(t, type) and (t in __FIXED_FORMATS or t is str):
+        return t.__name__
+
+    return "any"
+
+
+def __make_binary_value_codec(t: type) -> tuple[Callable[[any, bytearray], None], Callable[[bytes, int], tuple[any, int]]]:
+    # makes the writer and reader of a single (non-null) value of type `t`
+    if is_object(t):
+        codec = __get_binary_codec(t)
+        return codec[0], codec[1]
+    elif t is str:
+        return __write_str, __read_str
+    elif isinstance(t, type) and t in __FIXED_FORMATS:
+        fixed = struct.Struct("<" + __FIXED_FORMATS[t])
+        return (
+            lambda v, out: out.extend(fixed.pack(v)),
+            lambda data, pos: (fixed.unpack_from(data, pos)[0], pos + fixed.size),
+        )
+    elif not isinstance(t, GenericAlias):
+        return __write_dynamic, __read_dynamic
+
+    # `container` is what the values are read back into, which for `tuple[T, ...]` differs from its layout
+    origin, args = t.__origin__, t.__args__
+    container = origin
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        origin, args = list, args[:1]
+
+    if origin in (list, set) and len(args) == 1:
+        if isinstance(args[0], type) and args[0] in __FIXED_FORMATS:
+            # homogeneous numbers are packed with a single struct call
+            code = __FIXED_FORMATS[args[0]]
+            size = struct.calcsize(code)
+
+            def write(v, out):
+                __write_varint(len(v), out)
+                out += struct.pack("<%d%s" % (len(v), code), *v)
+
+            def read(data, pos):
+                n, pos = __read_varint(data, pos)
+                return container(struct.unpack_from("<%d%s" % (n, code), data, pos)), pos + n * size
+
+            return write, read
+
+        write_item, read_item = __make_binary_item_codec(args[0])
+
+        def write(v, out):
+            __write_varint(len(v), out)
+            for item in v:
+                write_item(item, out)
+
+        def read(data, pos):
+            n, pos = __read_varint(data, pos)
+            res = []
+            for _ in range(n):
+                item, pos = read_item(data, pos)
+                res.append(item)
+            return container(res) if container is not list else res, pos
+
+        return write, read
+    elif origin is tuple:
+        codecs = [__make_binary_item_codec(arg) for arg in args]
+
+        def write(v, out):
+            for (write_item, _), item in zip(codecs, v, strict=True):
+                write_item(item, out)
+
+        def read(data, pos):
+            res = []
+            for _, read_item in codecs:
+                item, pos = read_item(data, pos)
+                res.append(item)
+            return tuple(res), pos
+
+        return write, read
+    elif origin is dict and len(args) == 2:
+        write_key, read_key = __make_binary_value_codec(args[0])
+        write_item, read_item = __make_binary_item_codec(args[1])
+
+        def write(v, out):
+            __write_varint(len(v), out)
+            for key, item in v.items():
+                write_key(key, out)
+                write_item(item, out)
+
+        def read(data, pos):
+            n, pos = __read_varint(data, pos)
+            res = {}
+            for _ in range(n):
+                key, pos = read_key(data, pos)
+                res[key], pos = read_item(data, pos)
+            return res, pos
+
+        return write, read
+
+    return __write_dynamic, __read_dynamic
+
+
+def __make_binary_item_codec(t: type) -> tuple[Callable[[any, bytearray], None], Callable[[bytes, int], tuple[any, int]]]:
+    # makes the writer and reader of an item of a container of type `t`. Object items can be null, so they are
+    # prefixed with a byte telling whether the item is null
+    write_item, read_item = __make_binary_value_codec(t)
+    if not is_object(t):
+        return write_item, read_item
+
+    def write(v, out):
+        if v is None:
+            out.append(0)
+        else:
+            out.append(1)
+            write_item(v, out)
+
+    def read(data, pos):
+        if not data[pos]:
+            return None, pos + 1
+        return read_item(data, pos + 1)
+
+    return write, read
+
+
+def __make_binary_codec(cls: T) -> tuple[Callable, Callable, bytes]:
+    if not is_object(cls):
+        raise Exception("cannot make binary codec for non Object class")
+
+    namespace = dict(__name__="object_%s_binary" % cls.__name__)
+    namespace["OBJECT"] = cls
+    namespace["struct_error"] = struct.error
+    namespace["ERROR"] = "%s Object cannot be encoded to bytes: %%s" % getattr(cls, __OBJECT_NAME)
+
+    f: list[ObjectField] = fields(cls)
+    null_bytes = (len(f) + 7) // 8
+    fixed = [i for i, field in enumerate(f) if isinstance(field.field_type, type) and field.field_type in __FIXED_FORMATS]
+    variable = [i for i in range(len(f)) if i not in fixed]
+    namespace["FIXED"] = fixed_struct = struct.Struct("<" + "".join(__FIXED_FORMATS[f[i].field_type] for i in fixed))
+
+    writes = [f"    v{i} = self.{field.name}" for i, field in enumerate(f)]
+    writes.append("    nulls = 0")
+    for i in range(len(f)):
+        writes += [f"    if v{i} is None:", f"        nulls |= {1 << i}"]
+        if i in fixed:
+            writes.append(f"        v{i} = 0")
+    writes.append(f'    out += nulls.to_bytes({null_bytes}, "little")')
+    if fixed:
+        writes += [
+            "    try:",
+            f"        out += FIXED.pack({', '.join(f'v{i}' for i in fixed)})",
+            "    except struct_error as e:",
+            "        raise Exception(ERROR % e)",
+        ]
+    if variable:
+        # packed numeric lists raise `struct.error` on values which are not numbers
+        writes.append("    try:")
+        for i in variable:
+            namespace[f"WRITE_{i}"], namespace[f"READ_{i}"] = __make_binary_value_codec(f[i].field_type)
+            writes += [f"        if v{i} is not None:", f"            WRITE_{i}(v{i}, out)"]
+        writes += [
+            "    except struct_error as e:",
+            "        raise Exception(ERROR % e)",
+        ]
+
+    reads = [
+        f'    nulls = int.from_bytes(data[pos : pos + {null_bytes}], "little")',
+        f"    pos += {null_bytes}",
+    ]
+    if fixed:
+        reads += [
+            f"    {''.join(f'v{i}, ' for i in fixed)}= FIXED.unpack_from(data, pos)",
+            f"    pos += {fixed_struct.size}",
+        ]
+    for i in range(len(f)):
+        reads += [f"    if nulls & {1 << i}:", f"        v{i} = None"]
+        if i in variable:
+            reads += ["    else:", f"        v{i}, pos = READ_{i}(data, pos)"]
+
+    codec_def = __OBJECT_BINARY_TEMPLATE.format(
+        writes="\n".join(writes),
+        reads="\n".join(reads),
+        args=", ".join(f"v{i}" for i in range(len(f))),
+    )
+
+    exec(codec_def, namespace)
+    fingerprint = hashlib.blake2b(("v2:" + __binary_schema(cls)).encode("utf-8"), digest_size=8).digest()
+    return namespace["__write"], namespace["__read"], fingerprint
+
+
+def __get_binary_codec(cls: T) -> tuple[Callable, Callable, bytes]:
+    codec = cls.__dict__.get(__OBJECT_BINARY_CODEC, None)
+    if codec is None:
+        codec = __make_binary_codec(cls)
+        setattr(cls, __OBJECT_BINARY_CODEC, codec)
+
+    return codec
+
+
+def __to_bytes(self: T) -> bytes:
+    if not is_object(self):
+        raise Exception("cannot encode non Object class to bytes")
+
+    write, _, fingerprint = __get_binary_codec(type(self))
+    out = bytearray(fingerprint)
+    write(self, out)
+    return bytes(out)
+
+
+def __from_bytes(cls: T, data: bytes | bytearray | memoryview) -> T:
+    if not is_object(cls):
+        raise Exception("cannot decode non Object class from bytes")
+
+    _, read, fingerprint = __get_binary_codec(cls)
+    if data[: len(fingerprint)] != fingerprint:
+        raise Exception("%s Object bytes were encoded with a different schema" % getattr(cls, __OBJECT_NAME))
+
+    res, pos = read(data, len(fingerprint))
+    if pos != len(data):
+        raise Exception("%s Object bytes have trailing data" % getattr(cls, __OBJECT_NAME))
+
+    return res
+
+
+def __is_cow_type(t: type) -> bool:
+    # values of these types are mutable, so copy-on-write clones share them until they are first accessed
+    return is_object(t) or (is_container(t) and getattr(t, "__origin__", t) is not tuple)
+
+
+def __make_cloner(cls: T) -> tuple[Callable, Callable, Callable]:
+    if not is_object(cls):
+        raise Exception("cannot make cloner for non Object class")
+
+    namespace = dict(__name__="object_%s_cloner" % cls.__name__)
+    namespace["OBJECT"] = cls
+    namespace["COW_DATA"] = __OBJECT_COW_DATA
+    namespace["copy"] = copy.copy
+    namespace["deepcopy"] = copy.deepcopy
+    namespace["SETATTR"] = object.__setattr__
+
+    f: list[ObjectField] = fields(cls)
+    shallow = [f"    {__make_assignment(cls, 'res', field.name, f'other.{field.name}')}" for field in f]
+    cow = [
+        f"    {__make_assignment(cls, 'res', field.name, f'other.{field.name}')}"
+        for field in f if not __is_cow_type(field.field_type)
+    ]
+    shared = ", ".join(f"{field.name!r}: other.{field.name}" for field in f if __is_cow_type(field.field_type))
+    deep: list[str] = []
+    copiers: list[str] = []
+    for i, field in enumerate(f):
+        if field.field_type in (int, float, str, bool):
+            deep.append(f"    {__make_assignment(cls, 'res', field.name, f'other.{field.name}')}")
+            continue
+
+        if is_object(field.field_type):
+            deep_copy, shallow_copy = "v.of(v, deep=True)", "v.of(v, cow=True)"
+        else:
+            deep_copy, shallow_copy = "deepcopy(v)", "copy(v)"
+        deep += [
+            f"    v = other.{field.name}",
+            f"    {__make_assignment(cls, 'res', field.name, f'{deep_copy} if v is not None else None')}",
+        ]
+        if __is_cow_type(field.field_type):
+            copiers.append(__OBJECT_COW_FIELD_TEMPLATE.format(i=i, name=field.name, copy=shallow_copy))
+
+    cloner_def = __OBJECT_CLONER_TEMPLATE.format(
+        shallow="\n".join(shallow) or "    pass",
+        cow="\n".join(cow),
+        shared=shared,
+        deep="\n".join(deep) or "    pass",
+    )
+    exec(cloner_def + "\n" + "\n".join(copiers), namespace)
+
+    # copy-on-write clones are of a subclass which has a descriptor in place of every field holding a mutable value,
+    # which copies the shared value on first access. the encoders read the shared values without copying them
+    attrs = {
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+        __OBJECT_VARIANT: True,
+        __OBJECT_ENCODER: __make_encoder(cls, variant="cow"),
+        __OBJECT_JSON_WRITER: __make_json_writer(cls, variant="cow"),
+    }
+    for i, field in enumerate(f):
+        if __is_cow_type(field.field_type):
+            attrs[field.name] = __LazyField(namespace[f"__copy_{i}"])
+    namespace["COW"] = type(cls.__name__, (cls,), attrs)
+
+    return namespace["__shallow"], namespace["__cow"], namespace["__deep"]
+
+
+def __get_cloner(cls: T) -> tuple[Callable, Callable, Callable]:
+    # clones of lazy Objects and copy-on-write clones are of the Object class they are a variant of
+    if cls.__dict__.get(__OBJECT_VARIANT, False):
+        cls = cls.__bases__[0]
+
+    cloner = cls.__dict__.get(__OBJECT_CLONER, None)
+    if cloner is None:
+        cloner = __make_cloner(cls)
+        setattr(cls, __OBJECT_CLONER, cloner)
+
+    return cloner
+
+
+def __values_equal(x: any, y: any) -> bool:
+    # compares values of fields without a declared type which tells us how, recursing into Objects and containers.
+    # Objects are equal if they are of the same Object class and no field of them differs
+    if x is y:
+        return True
+    elif is_object(x) or is_object(y):
+        if not is_object(x) or not is_object(y):
+            return False
+        differ = __get_differ(type(x))
+        return differ is __get_differ(type(y)) and not differ(x, y)
+    elif isinstance(x, (list, tuple)):
+        return type(x) is type(y) and len(x) == len(y) and all(__values_equal(i, j) for i, j in zip(x, y))
+    elif isinstance(x, dict):
+        return (
+            type(y) is dict
+            and x.keys() == y.keys()
+            and all(__values_equal(v, y[k]) for k, v in x.items())
+        )
+
+    return x == y
+
+
+def __make_differ(cls: T) -> Callable:
+    if not is_object(cls):
+        raise Exception("cannot make differ for non Object class")
+
+    namespace = dict(__name__="object_%s_differ" % cls.__name__)
+    namespace["EQUAL"] = __values_equal
+
+    comparisons: list[str] = []
+    for i, field in enumerate(fields(cls)):
+        t = field.field_type
+        lines = [
+            f"x = a.{field.name}",
+            f"y = b.{field.name}",
+        ]
+        if is_object(t):
+            # a nested Object which changed is patched with its own patch instead of being replaced
+            namespace[f"SUB_{i}"] = t
+            lines += [
+                "if x is not y:",
+                f"    if isinstance(x, SUB_{i}) and isinstance(y, SUB_{i}):",
+                f"        d = SUB_{i}.diff(x, y)",
+                "        if d:",
+                f"            patch[{field.name!r}] = d",
+                "    else:",
+                f"        patch[{field.name!r}] = y",
+            ]
+        elif t in (int, float, str, bool):
+            lines += [
+                "if x != y:",
+                f"    patch[{field.name!r}] = y",
+            ]
+        else:
+            lines += [
+                "if not EQUAL(x, y):",
+                f"    patch[{field.name!r}] = y",
+            ]
+        comparisons += [f"    {line}" for line in lines]
+
+    exec(__OBJECT_DIFFER_TEMPLATE.format(comparisons="\n".join(comparisons)), namespace)
+    return namespace["__diff"]
+
+
+def __get_differ(cls: T) -> Callable:
+    if cls.__dict__.get(__OBJECT_VARIANT, False):
+        cls = cls.__bases__[0]
+
+    differ = cls.__dict__.get(__OBJECT_DIFFER, None)
+    if differ is None:
+        differ = __make_differ(cls)
+        setattr(cls, __OBJECT_DIFFER, differ)
+
+    return differ
+
+
+def __diff(cls: T, a: T, b: T) -> dict[str, any]:
+    if not is_object(cls):
+        raise Exception("cannot diff non Object class")
+    if not isinstance(a, cls) or not isinstance(b, cls):
+        raise Exception("%s Objects can only be diffed with each other" % getattr(cls, __OBJECT_NAME))
+
+    return __get_differ(cls)(a, b)
+
+
+def __apply_patch(self: T, patch: dict[str, any]):
+    if not is_object(self):
+        raise Exception("cannot patch non Object class")
+
+    f: dict[str, ObjectField] = getattr(self, __OBJECT_FIELDS)
+    for name, value in patch.items():
+        field = f.get(name, None)
+        if field is None:
+            raise Exception("%s Object has no field '%s' to patch" % (getattr(self, __OBJECT_NAME), name))
+
+        # nested Objects are diffed into patches of their own
+        if is_object(field.field_type) and isinstance(value, dict):
+            current = getattr(self, name)
+            if current is None:
+                raise Exception(
+                    "%s Object field '%s' is None and cannot be patched" % (getattr(self, __OBJECT_NAME), name)
+                )
+            current.apply_patch(value)
+        else:
+            setattr(self, name, value)
+
+
+def __make_row_codec(cls: T, columns: tuple[str | None, ...]) -> tuple[Callable, Callable]:
+    if not is_object(cls):
+        raise Exception("cannot make row codec for non Object class")
+
+    f: list[ObjectField] = fields(cls)
+    positions: dict[str, int] = {}
+    for j, name in enumerate(columns):
+        if name is None:
+            continue
+        if name not in getattr(cls, __OBJECT_FIELDS):
+            raise Exception("%s Object has no field '%s' for column %d" % (getattr(cls, __OBJECT_NAME), name, j))
+        positions[name] = j
+
+    # every row is unpacked into one name per column, which also checks its length. columns which aren't mapped to
+    # a field are unpacked into `_`, and fields without a column are given their default value
+    rows_def = __OBJECT_ROWS_TEMPLATE.format(
+        args=", ".join(
+            f"c{positions[field.name]}" if field.name in positions else f"DEFAULT_{i}" for i, field in enumerate(f)
+        ),
+        targets="".join("_, " if name is None else f"c{j}, " for j, name in enumerate(columns)),
+        values="".join("None, " if name is None else f"o.{name}, " for name in columns),
+    )
+
+    namespace = dict(__name__="object_%s_rows" % cls.__name__)
+    namespace["OBJECT"] = cls
+    for i, default in enumerate(__get_init_defaults(cls).values()):
+        namespace[f"DEFAULT_{i}"] = default
+    exec(rows_def, namespace)
+    return namespace["__from_rows"], namespace["__to_rows"]
+
+
+def __get_row_codec(cls: T, columns: Iterable[str | None] | None) -> tuple[Callable, Callable]:
+    columns = tuple(field.name for field in fields(cls)) if columns is None else tuple(columns)
+    if not columns:
+        raise Exception("%s Object rows must have at least one column" % getattr(cls, __OBJECT_NAME))
+
+    codecs = cls.__dict__.get(__OBJECT_ROW_CODECS, None)
+    if codecs is None:
+        codecs = {}
+        setattr(cls, __OBJECT_ROW_CODECS, codecs)
+
+    codec = codecs.get(columns, None)
+    if codec is None:
+        codec = __make_row_codec(cls, columns)
+        if len(codecs) >= __KEY_TABLES_MAX:
+            codecs.clear()
+        codecs[columns] = codec
+
+    return codec
+
+
+def __from_rows(cls: T, rows: Iterable[tuple | list], columns: Iterable[str | None] = None) -> list[T]:
+    if not is_object(cls):
+        raise Exception("cannot make non Object class from rows")
+
+    return __get_row_codec(cls, columns)[0](rows)
+
+
+def __to_rows(cls: T, objects: Iterable[T], columns: Iterable[str | None] = None) -> list[tuple]:
+    if not is_object(cls):
+        raise Exception("cannot turn non Object class into rows")
+
+    return __get_row_codec(cls, columns)[1](objects)
+
+
+def __fingerprint_default(value: any) -> any:
+    # encodes the values the json encoder of fingerprints can't encode itself. nested Objects are encoded as their
+    # own fingerprint, and the items of sets are sorted as their order doesn't matter to equality
+    if is_object(value):
+        return ["\x00object", value.fingerprint()]
+    elif isinstance(value, (set, frozenset)):
+        return ["\x00set"] + sorted(__FINGERPRINT_ENCODER.encode(item) for item in value)
+    elif isinstance(value, (bytes, bytearray)):
+        return ["\x00bytes", value.hex()]
+
+    raise TypeError("cannot fingerprint value of type '%s'" % type(value).__name__)
+
+
+# the json encoding of a value only depends on the value itself, as long as the keys of dicts are sorted
+__FINGERPRINT_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=__fingerprint_default)
+
+
+def __make_fingerprinter(cls: T) -> Callable:
+    if not is_object(cls):
+        raise Exception("cannot make fingerprinter for non Object class")
+
+    # all the field values are encoded by a single call to the json encoder
+    fingerprint_def = __OBJECT_FINGERPRINT_TEMPLATE.format(
+        values="".join(f"self.{field.name}, " for field in fields(cls)),
+    )
+
+    namespace = dict(__name__="object_%s_fingerprinter" % cls.__name__)
+    namespace["ENCODE"] = __FINGERPRINT_ENCODER.encode
+    namespace["BLAKE2B"] = hashlib.blake2b
+    namespace["HEADER"] = ("v1:%s:" % getattr(cls, __OBJECT_NAME)).encode("utf-8")
+    exec(fingerprint_def, namespace)
+    return namespace["__fingerprint"]
+
+
+def __get_fingerprinter(cls: T) -> Callable:
+    if cls.__dict__.get(__OBJECT_VARIANT, False):
+        cls = cls.__bases__[0]
+
+    fingerprinter = cls.__dict__.get(__OBJECT_FINGERPRINTER, None)
+    if fingerprinter is None:
+        fingerprinter = __make_fingerprinter(cls)
+        setattr(cls, __OBJECT_FINGERPRINTER, fingerprinter)
+
+    return fingerprinter
+
+
+def __fingerprint(self: T) -> str:
+    if not is_object(self):
+        raise Exception("cannot fingerprint non Object class")
+
+    # the fingerprint of a frozen Object can't change, so it is only computed once
+    if getattr(self, __OBJECT_FROZEN, False):
+        fingerprint = getattr(self, __OBJECT_FINGERPRINT, None)
+        if fingerprint is None:
+            fingerprint = __get_fingerprinter(type(self))(self)
+            object.__setattr__(self, __OBJECT_FINGERPRINT, fingerprint)
+        return fingerprint
+
+    return __get_fingerprinter(type(self))(self)
+
+
 def __process_attrs(cls: T):
     setattr(
         cls,
@@ -316,6 +2133,21 @@ def __process_fields(cls: T):
     setattr(cls, __OBJECT_FIELDS_LEN, len(fields))
 
 
+def __make_slots_class(cls: T, extra_slots: tuple[str, ...] = ()) -> T:
+    namespace = dict(cls.__dict__)
+    # the field defaults have already been moved into the field info, and would clash with the slots
+    for field in fields(cls):
+        namespace.pop(field.name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = tuple(field.name for field in fields(cls)) + extra_slots
+
+    res = type(cls)(cls.__name__, cls.__bases__, namespace)
+    # the qualified name isn't kept in the class dict, and classes nested in other classes are pickled by it
+    res.__qualname__ = cls.__qualname__
+    return res
+
+
 def keymap(in_key: str, out_key: str) -> T:
     def wrapper(cls: T) -> T:
         if not is_object(cls):
@@ -328,12 +2160,60 @@ def keymap(in_key: str, out_key: str) -> T:
         key_maps = getattr(cls, __OBJECT_KEY_MAPS, {})
         key_maps[in_key] = out_key
         setattr(cls, __OBJECT_KEY_MAPS, key_maps)
+        # the cached decoders and key tables were made from the old key maps
+        setattr(cls, __OBJECT_DECODER, None)
+        setattr(cls, __OBJECT_LAZY_DECODER, None)
+        setattr(cls, __OBJECT_KEY_TABLES, None)
+        setattr(cls, __OBJECT_PROJECTED_DECODERS, None)
+
+        return cls
+    return wrapper
+
+
+def interned(*names: str, max_size: int = 65536) -> Callable[[T], T]:
+    """makes the decoders of an Object class deduplicate the values of the given `str` (or `list[str]`) fields, so
+    records sharing a value also share a single string object. meant for low-cardinality fields, fx. status codes
+
+    Args:
+        *names (str): the names of the fields to intern
+        max_size (int): the maximum amount of distinct strings the pool of the class holds. once it is full, values
+        not already in the pool are kept as they are
+
+    Returns:
+        Callable[[T], T]: the class decorator
+    """
+
+    def wrapper(cls: T) -> T:
+        if not is_object(cls):
+            raise Exception("cannot intern fields of non Object class")
+
+        field_names = [field.name for field in fields(cls)]
+        for name in names:
+            if name not in field_names:
+                raise Exception("%s Object has no field '%s' to intern" % (getattr(cls, __OBJECT_NAME), name))
+
+        setattr(cls, __OBJECT_INTERNED, getattr(cls, __OBJECT_INTERNED, set()) | set(names))
+        setattr(cls, __OBJECT_STRING_POOL, getattr(cls, __OBJECT_STRING_POOL, {}))
+        setattr(cls, __OBJECT_STRING_POOL_SIZE, max_size)
+        # the cached decoders were made without interning these fields
+        setattr(cls, __OBJECT_DECODER, None)
+        setattr(cls, __OBJECT_LAZY_DECODER, None)
+        setattr(cls, __OBJECT_PROJECTED_DECODERS, None)
 
         return cls
     return wrapper
 
 
-def Object(cls: T) -> T:
+def Object(
+    cls: T = None,
+    *,
+    slots: bool = False,
+    track_changes: bool = False,
+    frozen: bool = False,
+    unsafe_hash: bool = False,
+    key: str = None,
+    identity_map_size: int = 65536,
+) -> T:
     """
     This is the main Object decorator function.
 
@@ -350,6 +2230,28 @@ def Object(cls: T) -> T:
     ----------
     cls: type
         A class to be processed. The class type is generic and is signified as 'T'.
+    slots: bool
+        Rebuild the class with `__slots__` holding its fields instead of a per-instance `__dict__`. This
+        lowers the memory used by each instance, at the cost of not being able to add other attributes.
+        Used as `@Object(slots=True)`.
+    track_changes: bool
+        Record which fields are assigned after an instance is made, so `to_dict` and `to_json` can encode only
+        those with `changed_only=True`. `mark_clean` forgets the recorded fields. Changes made inside a field's
+        value, fx. appending to a list, are not recorded. Used as `@Object(track_changes=True)`.
+    frozen: bool
+        Forbid assigning to the fields of an instance once it is made. The hash of a frozen instance is computed
+        once and then cached, and so is its fingerprint. Used as `@Object(frozen=True)`.
+    unsafe_hash: bool
+        Give a mutable Object a hash of its field values. Instances of mutable Objects are otherwise unhashable,
+        as assigning a field would change the hash of an instance already in a set or dict. Frozen Objects are
+        always hashable. Used as `@Object(unsafe_hash=True)`.
+    key: str
+        The name of a field identifying the entity an instance describes. Decoding data with a key which was
+        decoded before returns the same instance, updated with the new data, from the `identity_map` of the
+        class. Lazy decoding and decoding with a projection leaving out the key don't use the identity map.
+        Used as `@Object(key="id")`.
+    identity_map_size: int
+        The amount of instances the identity map holds before it evicts the least recently used one.
 
     Returns
     -------
@@ -361,18 +2263,70 @@ def Object(cls: T) -> T:
     Exception:
         An exception is raised if the passed object is not a class.
     """
+    if cls is None:
+        return lambda c: Object(
+            c,
+            slots=slots,
+            track_changes=track_changes,
+            frozen=frozen,
+            unsafe_hash=unsafe_hash,
+            key=key,
+            identity_map_size=identity_map_size,
+        )
     if not isinstance(cls, type):
         raise Exception("Object decorator can only be used on class object")
+    if track_changes and frozen:
+        raise Exception("a frozen Object cannot track changes")
 
     __process_attrs(cls)
     __process_fields(cls)
+    if slots:
+        cls = __make_slots_class(
+            cls, (__OBJECT_CHANGES,) if track_changes else (__OBJECT_HASH, __OBJECT_FINGERPRINT) if frozen else ()
+        )
+
+    setattr(cls, __OBJECT_TRACK_CHANGES, track_changes)
+    setattr(cls, __OBJECT_FROZEN, frozen)
+    setattr(cls, __OBJECT_KEY, key)
+    if key is not None:
+        if key not in getattr(cls, __OBJECT_FIELDS):
+            raise Exception("%s Object has no key field '%s'" % (getattr(cls, __OBJECT_NAME), key))
+        setattr(cls, "identity_map", IdentityMap(identity_map_size))
+    if track_changes:
+        setattr(cls, "__setattr__", __make_tracker(cls))
+        setattr(cls, __OBJECT_DELTA_ENCODER, __make_encoder(cls, changed_only=True))
+    if frozen:
+        frozen_setattr, frozen_delattr = __make_frozen_setattr(cls)
+        setattr(cls, "__setattr__", frozen_setattr)
+        setattr(cls, "__delattr__", frozen_delattr)
+
+    eq, object_hash = __make_equality(cls, unsafe_hash)
+    setattr(cls, "__eq__", eq)
+    setattr(cls, "__hash__", object_hash)
 
     setattr(cls, "__init__", __make_constructor(cls))
+    setattr(cls, "__reduce__", __make_reduce(cls))
+    setattr(cls, __OBJECT_ENCODER, __make_encoder(cls))
+    setattr(cls, __OBJECT_JSON_WRITER, __make_json_writer(cls))
     setattr(cls, "to_json", __to_json)
+    setattr(cls, "dump_json", __dump_json)
+    setattr(cls, "dump_json_many", classmethod(__dump_json_many))
     setattr(cls, "from_json", classmethod(__from_json))
+    setattr(cls, "from_json_many", classmethod(__from_json_many))
+    setattr(cls, "iter_json", classmethod(__iter_json))
+    setattr(cls, "from_json_parallel", classmethod(__from_json_parallel))
+    setattr(cls, "aiter_json", classmethod(__aiter_json))
     setattr(cls, "to_dict", __to_dict)
     setattr(cls, "copy_from", __copy_from)
+    setattr(cls, "mark_clean", __mark_clean)
     setattr(cls, "of", staticmethod(__of))
+    setattr(cls, "diff", classmethod(__diff))
+    setattr(cls, "from_rows", classmethod(__from_rows))
+    setattr(cls, "to_rows", classmethod(__to_rows))
+    setattr(cls, "fingerprint", __fingerprint)
+    setattr(cls, "apply_patch", __apply_patch)
     setattr(cls, "load_json", __load_json)
+    setattr(cls, "to_bytes", __to_bytes)
+    setattr(cls, "from_bytes", classmethod(__from_bytes))
 
     return cls
@@ -0,0 +1,296 @@
+from array import array
+from typing import TypeVar, Generic, Callable, Iterable, Iterator, Sequence
+from weakref import WeakKeyDictionary
+from ..json import JSONDecoder, JSONEncoder, default_decoder, default_encoder
+from ..primitive import camel_to_snake
+from .object import is_object, fields
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+T = TypeVar("T")
+
+
+# typecodes of the `array.array` columns backing numeric fields, and their matching numpy dtypes
+_TYPECODES = {int: "q", float: "d", bool: "b"}
+_DTYPES = {"q": "i8", "d": "f8", "b": "?"}
+
+# how many records are decoded at a time when building an array from json
+_DECODE_BATCH_SIZE = 4096
+
+_specialized: WeakKeyDictionary = WeakKeyDictionary()
+
+
+class ObjectArray(Generic[T]):
+    """a columnar container for a large collection of instances of the same Object class.
+    every field is stored in its own column; `int`, `float` and `bool` fields in compact `array.array` columns and
+    all other fields in lists. a row is only turned into an Object instance when it is indexed.
+
+    a numeric column falls back to a list the first time it is given a value that doesn't fit it, fx. `None`.
+
+    Example:
+        points = ObjectArray[Point]([Point(x=1, y=2), Point(x=3, y=4)])
+        xs = points.column("x")
+    """
+
+    __slots__ = ("_columns",)
+
+    _object: T = None
+    _field_types: dict[str, type] = {}
+
+    def __class_getitem__(cls, item: T) -> type:
+        if not is_object(item):
+            raise Exception("ObjectArray can only hold Object classes")
+
+        specialized = _specialized.get(item, None)
+        if specialized is None:
+            specialized = type(
+                "ObjectArray[%s]" % item.__name__,
+                (cls,),
+                {
+                    "__slots__": (),
+                    "_object": item,
+                    "_field_types": {field.name: field.field_type for field in fields(item)},
+                },
+            )
+            _specialized[item] = specialized
+
+        return specialized
+
+    def __init__(self, objects: Iterable[T] = ()):
+        if self._object is None:
+            raise Exception("ObjectArray must be given an Object class to hold, fx. ObjectArray[Cls]()")
+
+        self._columns: dict[str, array | list] = {}
+        for field in fields(self._object):
+            typecode = _TYPECODES.get(field.field_type, None)
+            self._columns[field.name] = array(typecode) if typecode is not None else []
+
+        self.extend(objects)
+
+    @classmethod
+    def _from_columns(cls, columns: dict[str, array | list]) -> "ObjectArray[T]":
+        res = cls.__new__(cls)
+        res._columns = columns
+        return res
+
+    @classmethod
+    def from_json_many(
+        cls,
+        data: str | Iterable[dict[str, any]],
+        *,
+        decoder: JSONDecoder = default_decoder(),
+        key_demangler: Callable[[str], str] = camel_to_snake,
+        **kwargs,
+    ) -> "ObjectArray[T]":
+        """decodes a json array of records straight into a new array. the records are decoded in batches, so only a
+        batch of Object instances is alive at a time
+
+        Args:
+            data (str | Iterable[dict[str, any]]): a json array string or the already parsed records
+            decoder (JSONDecoder): the decoder used for parsing `data` if it is a string
+            key_demangler (Callable[[str], str]): the function used to turn json keys into field names
+            **kwargs: any additional arguments to be passed to the decode function
+
+        Returns:
+            ObjectArray[T]: the new array
+        """
+
+        if isinstance(data, str):
+            data = decoder.decode(data, **kwargs)
+
+        res = cls()
+        batch: list[dict[str, any]] = []
+        for record in data:
+            batch.append(record)
+            if len(batch) == _DECODE_BATCH_SIZE:
+                res.extend(cls._object.from_json_many(batch, key_demangler=key_demangler))
+                batch.clear()
+        res.extend(cls._object.from_json_many(batch, key_demangler=key_demangler))
+
+        return res
+
+    def _demote(self, name: str) -> list:
+        column = self._columns[name]
+        values = column.tolist()
+        if column.typecode == "b":
+            values = [bool(value) for value in values]
+
+        self._columns[name] = values
+        return values
+
+    def append(self, obj: T):
+        """appends an instance to the end of the array
+
+        Args:
+            obj (T): the Object instance to append
+        """
+
+        if not isinstance(obj, self._object):
+            raise Exception("%s can only hold %s Objects" % (type(self).__name__, self._object.__name__))
+
+        appended: list[array | list] = []
+        try:
+            for name, column in self._columns.items():
+                value = getattr(obj, name, None)
+                if isinstance(column, array):
+                    if type(value) is self._field_types[name]:
+                        try:
+                            column.append(value)
+                            appended.append(column)
+                            continue
+                        except OverflowError:
+                            pass
+                    column = self._demote(name)
+                column.append(value)
+                appended.append(column)
+        except BufferError as e:
+            # a column with a numpy view alive cannot grow, so the columns which already grew are shrunk back to keep
+            # every column the same length
+            for column in appended:
+                column.pop()
+            name = type(self).__name__
+            raise Exception("cannot append to %s while numpy views of its columns are alive" % name) from e
+
+    def extend(self, objects: Iterable[T]):
+        """appends every instance of `objects` to the end of the array
+
+        Args:
+            objects (Iterable[T]): the Object instances to append
+        """
+
+        for obj in objects:
+            self.append(obj)
+
+    def column(self, name: str) -> Sequence[any]:
+        """gets the column of a field. numeric columns are returned as a read-only numpy view without copying the
+        data if numpy is installed, otherwise the backing column is returned as it is. note that the array cannot
+        grow while numpy views of it are alive
+
+        Args:
+            name (str): the name of the field
+
+        Returns:
+            Sequence[any]: all the values of the field, in order
+        """
+
+        if name not in self._columns:
+            raise KeyError(name)
+
+        column = self._columns[name]
+        if numpy is not None and isinstance(column, array):
+            dtype = _DTYPES[column.typecode]
+            view = numpy.frombuffer(column, dtype=dtype) if column else numpy.empty(0, dtype=dtype)
+            view.flags.writeable = False
+            return view
+
+        return column
+
+    def filter(self, predicate: Callable[[T], bool] | Sequence[bool]) -> "ObjectArray[T]":
+        """creates a new array holding only the rows matching `predicate`
+
+        Args:
+            predicate (Callable[[T], bool] | Sequence[bool]): either a function called with every row, or a mask
+            with a truthy value for every row to keep, fx. the result of a vectorized comparison on a column
+
+        Returns:
+            ObjectArray[T]: the new array
+        """
+
+        if callable(predicate):
+            indices = [i for i, obj in enumerate(self) if predicate(obj)]
+        else:
+            if len(predicate) != len(self):
+                raise Exception("filter mask must have the same length as the array")
+            if numpy is not None:
+                indices = numpy.flatnonzero(numpy.asarray(predicate, dtype=bool))
+            else:
+                indices = [i for i, keep in enumerate(predicate) if keep]
+
+        return self._take(indices)
+
+    def _take(self, indices: Sequence[int]) -> "ObjectArray[T]":
+        columns: dict[str, array | list] = {}
+        for name, column in self._columns.items():
+            if isinstance(column, array):
+                if numpy is not None and len(column):
+                    taken = array(column.typecode)
+                    taken.frombytes(numpy.frombuffer(column, dtype=_DTYPES[column.typecode])[indices].tobytes())
+                else:
+                    taken = array(column.typecode, [column[i] for i in indices])
+            else:
+                taken = [column[i] for i in indices]
+            columns[name] = taken
+
+        return self._from_columns(columns)
+
+    def _row(self, index: int) -> T:
+        args: dict[str, any] = {}
+        for name, column in self._columns.items():
+            value = column[index]
+            if type(column) is array and column.typecode == "b":
+                value = bool(value)
+            args[name] = value
+
+        return self._object(**args)
+
+    def __getitem__(self, item: int | slice) -> "T | ObjectArray[T]":
+        if isinstance(item, slice):
+            return self._from_columns({name: column[item] for name, column in self._columns.items()})
+
+        length = len(self)
+        if item < 0:
+            item += length
+        if not 0 <= item < length:
+            raise IndexError("ObjectArray index out of range")
+
+        return self._row(item)
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def __len__(self) -> int:
+        for column in self._columns.values():
+            return len(column)
+        return 0
+
+    def __repr__(self) -> str:
+        return "%s(len=%d)" % (type(self).__name__, len(self))
+
+    def to_dict(self, *, skip_null: bool = False, use_default_value: bool = False) -> list[dict[str, any]]:
+        """turns every row into a dict, like `to_dict` on the Object instances would
+
+        Args:
+            skip_null (bool): leave out fields holding `None`
+            use_default_value (bool): use the default value of fields holding `None`
+
+        Returns:
+            list[dict[str, any]]: a dict for every row, in order
+        """
+
+        return [obj.to_dict(skip_null=skip_null, use_default_value=use_default_value) for obj in self]
+
+    def to_json(
+        self,
+        *,
+        encoder: JSONEncoder = default_encoder(),
+        skip_null: bool = False,
+        use_default_value: bool = False,
+        **kwargs,
+    ) -> str:
+        """encodes the rows into a json array
+
+        Args:
+            encoder (JSONEncoder): the encoder used to produce the json string
+            skip_null (bool): leave out fields holding `None`
+            use_default_value (bool): use the default value of fields holding `None`
+            **kwargs: any additional arguments to be passed to the encode function
+
+        Returns:
+            str: the json array string
+        """
+
+        return encoder.encode(self.to_dict(skip_null=skip_null, use_default_value=use_default_value), **kwargs)
@@ -0,0 +1,320 @@
+import json
+import mmap
+import os
+from array import array
+from typing import TypeVar, Generic, Iterable, Iterator
+from weakref import WeakKeyDictionary
+from .object import is_object, fields
+# the binary codec of a class writes and reads its records without the schema fingerprint `to_bytes` prefixes them with,
+# as the header of the store already holds it
+from .object import __get_binary_codec as _get_binary_codec
+
+T = TypeVar("T")
+
+
+# the formats records can be stored in
+_FORMATS = ("binary", "json")
+
+# the types a key field can have, whose values are kept as json in the keys file
+_KEY_TYPES = (str, int, float, bool)
+
+# the index file starts with a header of the magic, the format padded to 8 bytes and the schema fingerprint
+_MAGIC = b"SUSHIOS1"
+_HEADER_SIZE = 24
+
+# how many records are written at a time when extending a store
+_WRITE_BATCH_SIZE = 4096
+
+_specialized: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def _header(cls: type, format: str) -> bytes:
+    _, _, fingerprint = _get_binary_codec(cls)
+    return _MAGIC + format.encode("ascii").ljust(8, b"\0") + fingerprint
+
+
+class ObjectStore(Generic[T]):
+    """an append-only file of encoded instances of the same Object class, read through `mmap`.
+
+    the records are stored back to back in the file at `path`, either in the compact binary form of `to_bytes`,
+    without its schema fingerprint, or as json. the end offset of every record is kept in `path + ".index"`, so a record can be read by its position without
+    reading any other record, and a record is only decoded when it is read; json records are decoded lazily.
+    if a `key` field is given, its value for every record is kept in `path + ".keys"`, and records can also be read by
+    key. a later record replaces an earlier record with the same key. the key field must be a str, int, float or bool
+    field. the index starts with the format and a fingerprint of the fields of the Object class, and a store can only
+    be opened with the same format and class it was written with.
+
+    data which was written after the last indexed record, fx. by a process which was killed while appending, is
+    dropped when the store is opened.
+
+    Example:
+        with ObjectStore[User]("users.store", key="id") as users:
+            users.append(User(id=1, name="daniel"))
+            user = users.get(1)
+    """
+
+    __slots__ = ("_path", "_format", "_key", "_file", "_map", "_ends", "_keys", "_index_file", "_keys_file")
+
+    _object: T = None
+
+    def __class_getitem__(cls, item: T) -> type:
+        if not is_object(item):
+            raise Exception("ObjectStore can only hold Object classes")
+
+        specialized = _specialized.get(item, None)
+        if specialized is None:
+            specialized = type(
+                "ObjectStore[%s]" % item.__name__,
+                (cls,),
+                {
+                    "__slots__": (),
+                    "_object": item,
+                },
+            )
+            _specialized[item] = specialized
+
+        return specialized
+
+    def __init__(self, path: str | os.PathLike, *, key: str = None, format: str = "binary"):
+        if self._object is None:
+            raise Exception("ObjectStore must be given an Object class to hold, fx. ObjectStore[Cls](path)")
+        if format not in _FORMATS:
+            raise Exception("ObjectStore format must be one of %s" % ", ".join(_FORMATS))
+        key_field = next((field for field in fields(self._object) if field.name == key), None)
+        if key is not None and key_field is None:
+            raise Exception("%s Object has no key field '%s'" % (self._object.__name__, key))
+        if key_field is not None and key_field.field_type not in _KEY_TYPES:
+            raise Exception(
+                "ObjectStore key field '%s' must be one of %s" % (key, ", ".join(t.__name__ for t in _KEY_TYPES))
+            )
+
+        self._path = os.fspath(path)
+        self._format = format
+        self._key = key
+        self._map: mmap.mmap | None = None
+
+        header = _header(self._object, format)
+        self._ends = array("Q")
+        index_path = self._path + ".index"
+        index = b""
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as fp:
+                index = fp.read()
+        # a store whose header was only partly written has no records, and is started over
+        if len(index) >= _HEADER_SIZE:
+            if index[: len(_MAGIC)] != _MAGIC:
+                raise Exception("%s is not an ObjectStore index" % index_path)
+            stored_format = index[len(_MAGIC) : 16].rstrip(b"\0").decode("ascii", "replace")
+            if stored_format != format:
+                raise Exception("ObjectStore %s was written in %s format, not %s" % (self._path, stored_format, format))
+            if index[16:_HEADER_SIZE] != header[16:]:
+                raise Exception(
+                    "ObjectStore %s was written with a different %s schema" % (self._path, self._object.__name__)
+                )
+            # an index entry which was only partly written is dropped
+            entries = index[_HEADER_SIZE:]
+            self._ends.frombytes(entries[: len(entries) - len(entries) % self._ends.itemsize])
+
+        self._file = open(self._path, "a+b")
+        # drop a record which was only partly written
+        size = self._ends[-1] if self._ends else 0
+        if os.fstat(self._file.fileno()).st_size > size:
+            self._file.truncate(size)
+        if len(index) >= _HEADER_SIZE:
+            self._index_file = open(index_path, "r+b")
+            self._index_file.truncate(_HEADER_SIZE + len(self._ends) * self._ends.itemsize)
+            self._index_file.seek(0, os.SEEK_END)
+        else:
+            self._index_file = open(index_path, "wb")
+            self._index_file.write(header)
+            self._index_file.flush()
+
+        self._keys: dict[any, int] | None = None
+        self._keys_file = None
+        if key is not None:
+            self._load_keys()
+
+    def _load_keys(self):
+        keys_path = self._path + ".keys"
+        lines: list[bytes] = []
+        if os.path.exists(keys_path):
+            with open(keys_path, "rb") as fp:
+                lines = fp.read().splitlines()
+        # the keys of records which were appended after the last indexed record are dropped
+        if len(lines) > len(self._ends):
+            lines = lines[: len(self._ends)]
+            with open(keys_path, "wb") as fp:
+                fp.writelines(line + b"\n" for line in lines)
+
+        keys: list[any] = json.loads(b"[" + b",".join(lines) + b"]")
+        self._keys = {value: position for position, value in enumerate(keys)}
+
+        # records whose keys are missing have their keys recovered by decoding them
+        self._keys_file = open(keys_path, "ab")
+        missing = [getattr(self[position], self._key) for position in range(len(keys), len(self._ends))]
+        for position, value in enumerate(missing, len(keys)):
+            self._keys[value] = position
+        self._keys_file.writelines(json.dumps(value).encode() + b"\n" for value in missing)
+
+    def _key_of(self, obj: T) -> any:
+        # keys are checked before anything is written, as only these types are read back as the same value
+        value = getattr(obj, self._key)
+        if value is not None and type(value) not in _KEY_TYPES:
+            raise Exception("ObjectStore key '%s' cannot be a %s" % (self._key, type(value).__name__))
+
+        return value
+
+    def _encode(self, obj: T) -> bytes | bytearray:
+        if self._format == "json":
+            return obj.to_json(direct=True).encode()
+
+        write, _, _ = _get_binary_codec(self._object)
+        out = bytearray()
+        write(obj, out)
+        return out
+
+    def _view(self) -> mmap.mmap:
+        # the file is only mapped again once it has grown past the current mapping
+        end = self._ends[-1] if self._ends else 0
+        if self._map is None or len(self._map) < end:
+            self._file.flush()
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return self._map
+
+    def _read(self, position: int) -> T:
+        start = self._ends[position - 1] if position > 0 else 0
+        end = self._ends[position]
+        data = self._view()[start:end]
+        if self._format == "json":
+            return self._object.from_json(data, lazy=True)
+        _, read, _ = _get_binary_codec(self._object)
+        res, pos = read(data, 0)
+        if pos != len(data):
+            raise Exception("%s record %d has trailing data" % (type(self).__name__, position))
+        return res
+
+    def _check(self, obj: T):
+        if not isinstance(obj, self._object):
+            raise Exception("%s can only hold %s Objects" % (type(self).__name__, self._object.__name__))
+
+    def _write(self, records: list[bytes | bytearray], keys: list[any]):
+        end = self._ends[-1] if self._ends else 0
+        start = len(self._ends)
+        for data in records:
+            end += len(data)
+            self._ends.append(end)
+
+        # the data is written before its index entries, so an interrupted append never indexes a partial record
+        self._file.writelines(records)
+        self._file.flush()
+        self._index_file.write(self._ends[start:].tobytes())
+
+        if self._key is not None:
+            for position, value in enumerate(keys, start):
+                self._keys[value] = position
+            self._keys_file.writelines(json.dumps(value).encode() + b"\n" for value in keys)
+
+    def append(self, obj: T) -> int:
+        """appends an instance to the end of the store
+
+        Args:
+            obj (T): the Object instance to append
+
+        Returns:
+            int: the position of the new record
+        """
+
+        self._check(obj)
+        keys = [self._key_of(obj)] if self._key is not None else []
+        self._write([self._encode(obj)], keys)
+        return len(self._ends) - 1
+
+    def extend(self, objects: Iterable[T]):
+        """appends every instance of `objects` to the end of the store. the records are written in batches
+
+        Args:
+            objects (Iterable[T]): the Object instances to append
+        """
+
+        records: list[bytes | bytearray] = []
+        keys: list[any] = []
+        for obj in objects:
+            self._check(obj)
+            if self._key is not None:
+                keys.append(self._key_of(obj))
+            records.append(self._encode(obj))
+            if len(records) == _WRITE_BATCH_SIZE:
+                self._write(records, keys)
+                records, keys = [], []
+
+        if records:
+            self._write(records, keys)
+
+    def get(self, key: any, default: T = None) -> T:
+        """reads the latest record with the given key
+
+        Args:
+            key (any): the value of the key field to look up
+            default (T): the value returned if no record has the key
+
+        Returns:
+            T: the decoded Object instance, or `default`
+        """
+
+        if self._keys is None:
+            raise Exception("%s has no key field" % type(self).__name__)
+
+        position = self._keys.get(key, None)
+        if position is None:
+            return default
+
+        return self._read(position)
+
+    def flush(self):
+        """writes all appended records and their index entries to disk"""
+
+        self._file.flush()
+        self._index_file.flush()
+        if self._keys_file is not None:
+            self._keys_file.flush()
+
+    def close(self):
+        """flushes and closes the files of the store"""
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        for fp in (self._file, self._index_file, self._keys_file):
+            if fp is not None:
+                fp.close()
+
+    def __enter__(self) -> "ObjectStore[T]":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getitem__(self, item: int) -> T:
+        length = len(self._ends)
+        if item < 0:
+            item += length
+        if not 0 <= item < length:
+            raise IndexError("ObjectStore index out of range")
+
+        return self._read(item)
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(len(self._ends)):
+            yield self._read(i)
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __contains__(self, key: any) -> bool:
+        return self._keys is not None and key in self._keys
+
+    def __repr__(self) -> str:
+        return "%s(%r, len=%d)" % (type(self).__name__, self._path, len(self))
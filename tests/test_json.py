@@ -48,3 +48,42 @@ def test_json_encode():
     custom_json_str_2 = to_json(data)
     assert custom_json_str_1 == custom_json_str_2
     assert custom_json_str_1.endswith("...")
+
+
+def test_iter_json():
+    import io
+
+    records = [{"id": i, "name": "ø" * i} for i in range(50)]
+    ndjson = "\n".join(json.dumps(record) for record in records)
+
+    assert list(iter_json(io.StringIO(ndjson), chunk_size=8)) == records
+    assert list(iter_json(io.BytesIO(ndjson.encode()), chunk_size=3)) == records
+    assert list(iter_json(io.StringIO(json.dumps(records, indent=4)), chunk_size=5)) == records
+    assert list(iter_json(io.StringIO(" [ ] "))) == []
+
+    # numbers cut off by the end of a chunk are read on
+    numbers = [1.5, -2.25e10, 3e-7, 10, 0.0, 12345.678E+3]
+    for chunk_size in range(1, 12):
+        assert list(iter_json(io.StringIO("1.5 -2.25e10\n3e-7 10 0.0 12345.678E+3"), chunk_size=chunk_size)) == numbers
+        assert list(iter_json(io.StringIO(json.dumps(numbers)), chunk_size=chunk_size)) == numbers
+
+    for data in ("[1, 2", "[1, 2]\n[3, 4]", "[1] x"):
+        try:
+            list(iter_json(io.StringIO(data)))
+            assert False
+        except json.JSONDecodeError:
+            pass
+
+
+def test_aiter_json():
+    import asyncio
+
+    async def decode() -> list:
+        # a limit smaller than the lines makes the reader split them up
+        reader = asyncio.StreamReader(limit=8)
+        reader.feed_data(b'{"id": 1, "tags": ["a", "b"]}\n\n{"id": 2}\n')
+        reader.feed_data(b'[1, 2, 3]')
+        reader.feed_eof()
+        return [value async for value in aiter_json(reader, decoder=JSONDecoder(json.loads), offload_size=16)]
+
+    assert asyncio.run(decode()) == [{"id": 1, "tags": ["a", "b"]}, {"id": 2}, [1, 2, 3]]
@@ -1,6 +1,7 @@
 import json
 from sushitools.json import default_encoder, default_decoder
-from sushitools.types import Object, fields, is_object, ObjectField, keymap
+from sushitools.primitive import camel_to_snake
+from sushitools.types import Object, fields, is_object, ObjectField, keymap, interned
 
 
 def test_INIT():
@@ -93,3 +94,755 @@ def test_nested_object():
     print(person.id.country)
     print(person.id.security_number)
     print(person.age)
+
+
+def test_compiled_decoder():
+    @Object
+    class Record:
+        id: int
+        name: str = "unknown"
+        score: float = 1.5
+        tags: list[str]
+
+    record: Record = Record.from_json({"id": 1, "name": None, "tags": ["a", "b"]})
+    assert record.id == 1
+    assert record.name == "unknown"
+    assert record.score == 1.5
+    assert record.tags == ["a", "b"]
+
+    decoder = Record.__object_decoder__
+    Record.from_json('{"id": 2}')
+    assert Record.__object_decoder__ is decoder
+
+    try:
+        Record.from_json({"id": "1"})
+        assert False
+    except Exception as e:
+        assert str(e) == "Record Object field 'id' must be of type 'int'"
+
+    keymap("recordName", "name")(Record)
+    assert Record.from_json({"recordName": "renamed"}).name == "renamed"
+
+
+def test_generated_encoder():
+    @Object
+    class Tag:
+        label: str
+
+    @Object
+    class Post:
+        title: str = "untitled"
+        views: int
+        rating: float
+        tag: Tag
+        tags: list[Tag]
+        tags_by_name: dict[str, Tag]
+        flags: set[str]
+
+    post: Post = Post(
+        title='say "hi"',
+        views=3,
+        rating=4.5,
+        tag=Tag(label="a"),
+        tags=[Tag(label="b")],
+        tags_by_name={"c": Tag(label="c")},
+        flags={"pinned"},
+    )
+    d = post.to_dict()
+    assert d["tag"] == {"label": "a"}
+    assert d["tags"] == [{"label": "b"}]
+    assert d["tags_by_name"] == {"c": {"label": "c"}}
+    assert d["flags"] == ["pinned"]
+    assert post.to_json(direct=True) == json.dumps(d) == post.to_json()
+
+    empty: Post = Post()
+    for skip_null in (True, False):
+        for use_default_value in (True, False):
+            assert empty.to_json(
+                direct=True, skip_null=skip_null, use_default_value=use_default_value
+            ) == json.dumps(empty.to_dict(skip_null=skip_null, use_default_value=use_default_value))
+
+
+def test_from_json_many():
+    @Object
+    class Point:
+        x: int
+        y: int
+
+    points: list[Point] = Point.from_json_many('[{"x": 1, "y": 2}, {"x": 3, "y": 4}]')
+    assert [(p.x, p.y) for p in points] == [(1, 2), (3, 4)]
+
+    points = Point.from_json_many([{"x": 5}])
+    assert len(points) == 1 and points[0].x == 5 and points[0].y is None
+
+    assert Point.from_json_many("[]") == []
+
+
+def test_iter_json(tmp_path):
+    @Object
+    class Event:
+        id: int
+        kind: str
+
+    path = tmp_path / "events.ndjson"
+    path.write_text("\n".join(json.dumps({"id": i, "kind": "click"}) for i in range(100)))
+
+    events = Event.iter_json(path, chunk_size=16)
+    first: Event = next(events)
+    assert first.id == 0 and first.kind == "click"
+    assert [event.id for event in events] == list(range(1, 100))
+
+    with open(path) as fp:
+        assert sum(1 for _ in Event.iter_json(fp)) == 100
+
+
+def test_slots():
+    @Object(slots=True)
+    class Sample:
+        id: int
+        label: str = "none"
+        values: list[int]
+
+    sample: Sample = Sample(id=1, values=[1, 2])
+    assert not hasattr(sample, "__dict__")
+    assert Sample.__slots__ == ("id", "label", "values")
+    assert sample.label == "none"
+    assert [field.name for field in fields(Sample)] == ["id", "label", "values"]
+    assert sample.to_dict() == {"id": 1, "label": "none", "values": [1, 2]}
+
+    copy: Sample = Sample.of(sample)
+    assert copy.id == 1 and copy.values == [1, 2]
+
+    copy.load_json('{"id": 2, "label": "two"}')
+    assert copy.id == 2 and copy.label == "two"
+
+    assert Sample.from_json(sample.to_json()).to_dict() == sample.to_dict()
+
+    try:
+        sample.other = 1
+        assert False
+    except AttributeError:
+        pass
+
+
+def test_lazy_from_json():
+    @Object
+    class Owner:
+        user_name: str
+
+    @Object
+    class Repo:
+        name: str
+        stars: int
+        owner: Owner
+        ratio: float
+
+    data = {"name": "sushitools", "stars": None, "owner": {"userName": "munchii"}, "ratio": "not a float"}
+    repo: Repo = Repo.from_json(data, lazy=True)
+    assert isinstance(repo, Repo)
+    assert "name" not in repo.__dict__
+
+    assert repo.name == "sushitools"
+    assert "name" in repo.__dict__
+    assert repo.owner.user_name == "munchii"
+
+    # untouched fields are passed through without being converted
+    assert repo.to_dict()["ratio"] == "not a float"
+    assert repo.to_json(direct=True) == json.dumps(repo.to_dict())
+    assert repo.to_dict()["owner"] == {"user_name": "munchii"}
+
+    try:
+        repo.ratio
+        assert False
+    except Exception as e:
+        assert str(e) == "Repo Object field 'ratio' must be of type 'float'"
+
+    repo.stars = 5
+    assert repo.to_dict()["stars"] == 5
+
+
+def test_key_table():
+    @keymap("ID", "user_id")
+    @Object
+    class Account:
+        user_id: int
+        display_name: str
+        camelField: str
+
+    account: Account = Account.from_json(
+        {"ID": 1, "displayName": "a", "camelField": "b", "unknownKey": 0, "DisplayName": "c"}
+    )
+    assert account.user_id == 1
+    assert account.display_name == "c"
+    assert account.camelField == "b"
+
+    table = Account.__object_key_tables__[camel_to_snake]
+    assert table["ID"] == "user_id"
+    assert table["displayName"] == table["display_name"] == "display_name"
+    assert table["unknownKey"] is None
+
+    for i in range(2000):
+        Account.from_json({"key%d" % i: i})
+    assert len(table) < 1100
+
+
+def test_from_json_buffers(tmp_path):
+    @Object
+    class Message:
+        topic: str
+        size: int
+
+    raw = b'{"topic": "orders", "size": 3}'
+    for data in (raw, bytearray(raw), memoryview(raw), memoryview(b"xx" + raw + b"xx")[2:-2]):
+        message: Message = Message.from_json(data)
+        assert (message.topic, message.size) == ("orders", 3)
+
+    path = tmp_path / "messages.json"
+    path.write_bytes(b"[" + raw + b", " + raw + b"]")
+    assert [message.size for message in Message.from_json_many(path)] == [3, 3]
+
+    message = Message()
+    message.load_json(raw)
+    assert message.topic == "orders"
+
+
+def test_bytes():
+    @Object
+    class Location:
+        city: str
+        coordinates: tuple[float, float]
+
+    @Object
+    class Store:
+        id: int
+        name: str
+        open: bool
+        rating: float
+        location: Location
+        branches: list[Location]
+        stock: dict[str, int]
+        prices: list[float]
+        extra: dict[str, any]
+
+    store: Store = Store(
+        id=-7,
+        name="søren's",
+        open=True,
+        rating=4.5,
+        location=Location(city="Aarhus", coordinates=(56.1, 10.2)),
+        branches=[Location(city="Odense", coordinates=(55.4, 10.4))],
+        stock={"rice": 20},
+        prices=[1.5, 2.0],
+        extra={"tags": ["a", None, 2 ** 80], "nested": {"ok": False}},
+    )
+    data: bytes = store.to_bytes()
+    assert isinstance(data, bytes)
+
+    decoded: Store = Store.from_bytes(data)
+    assert decoded.to_dict() == store.to_dict()
+    assert decoded.location.coordinates == (56.1, 10.2)
+
+    empty: Store = Store.from_bytes(Store().to_bytes())
+    assert empty.to_dict() == Store().to_dict()
+
+    try:
+        Location.from_bytes(data)
+        assert False
+    except Exception as e:
+        assert str(e) == "Location Object bytes were encoded with a different schema"
+
+    # Object items can be null
+    store.branches = [None, Location(city="Vejle", coordinates=(55.7, 9.5))]
+    decoded = Store.from_bytes(store.to_bytes())
+    assert decoded.branches[0] is None and decoded.branches[1].city == "Vejle"
+
+    store.prices = [1.5, None]
+    try:
+        store.to_bytes()
+        assert False
+    except Exception as e:
+        assert str(e).startswith("Store Object cannot be encoded to bytes: ")
+
+
+def test_clones():
+    @Object
+    class Settings:
+        retries: int
+
+    @Object
+    class Template:
+        name: str
+        headers: dict[str, str]
+        codes: list[int]
+        settings: Settings
+
+    template: Template = Template(
+        name="base", headers={"accept": "json"}, codes=[200], settings=Settings(retries=3)
+    )
+
+    shallow: Template = Template.of(template)
+    assert type(shallow) is Template
+    assert shallow.name == "base" and shallow.codes is template.codes
+
+    clone: Template = Template.of(template, cow=True)
+    assert isinstance(clone, Template)
+    assert clone.to_dict() == template.to_dict()
+    clone.headers["x-request"] = "1"
+    clone.codes.append(404)
+    clone.settings.retries = 5
+    assert template.headers == {"accept": "json"}
+    assert template.codes == [200]
+    assert template.settings.retries == 3
+    assert clone.to_dict()["codes"] == [200, 404]
+
+    # assigning to the fields of the template leaves its copy-on-write clones as they were
+    fresh: Template = Template.of(template, cow=True)
+    template.codes = [500]
+    template.settings = Settings(retries=1)
+    assert fresh.codes == [200] and fresh.settings.retries == 3
+    template.codes, template.settings = [200], Settings(retries=3)
+    # once a clone has accessed a field, it no longer shares it with the template
+    accessed: Template = Template.of(template, cow=True)
+    assert accessed.codes == [200]
+    template.codes.append(503)
+    assert accessed.codes == [200]
+    template.codes.pop()
+
+    deep: Template = Template.of(template, deep=True)
+    assert deep.settings is not template.settings and deep.codes is not template.codes
+    assert deep.to_dict() == template.to_dict()
+
+
+def test_interned():
+    @interned("status", "tags")
+    @Object
+    class Event:
+        status: str
+        tags: list[str]
+        message: str
+
+    events: list[Event] = Event.from_json_many(
+        [{"status": "active", "tags": ["a", "b"], "message": "hello %d" % i} for i in range(10)]
+    )
+    assert all(event.status is events[0].status for event in events)
+    assert all(event.tags[1] is events[0].tags[1] for event in events)
+    assert events[3].message == "hello 3"
+
+    lazy: Event = Event.from_json('{"status": "active", "tags": [], "message": ""}', lazy=True)
+    assert lazy.status is events[0].status
+
+
+
+@Object
+class PickledSettings:
+    retries: int
+
+
+@Object(slots=True)
+class PickledTemplate:
+    name: str
+    codes: list[int]
+    settings: PickledSettings
+
+
+def test_pickle():
+    import pickle
+
+    template: PickledTemplate = PickledTemplate(name="base", codes=[200], settings=PickledSettings(retries=3))
+    data: bytes = pickle.dumps(template)
+    assert b"codes" not in data
+    assert pickle.loads(data).to_dict() == template.to_dict()
+
+    lazy: PickledTemplate = PickledTemplate.from_json(template.to_json(), lazy=True)
+    loaded: PickledTemplate = pickle.loads(pickle.dumps(lazy))
+    assert type(loaded) is PickledTemplate
+    assert loaded.to_dict() == template.to_dict()
+
+    nested: PickledGroup.Member = PickledGroup.Member(name="a")
+    assert PickledGroup.Member.__qualname__ == "PickledGroup.Member"
+    assert pickle.loads(pickle.dumps(nested)) == nested
+
+
+class PickledGroup:
+    @Object(slots=True)
+    class Member:
+        name: str
+
+
+@Object
+class ParallelRecord:
+    id: int
+    name: str
+
+
+def test_from_json_parallel(tmp_path):
+    # every seventh name looks like a record boundary, which must not split the record
+    records = [{"id": i, "name": "a},{b" if i % 7 == 0 else "record %d" % i} for i in range(500)]
+    array_path = tmp_path / "records.json"
+    array_path.write_text(json.dumps(records))
+    ndjson_path = tmp_path / "records.ndjson"
+    ndjson_path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+
+    for src in (array_path, ndjson_path, array_path.read_bytes()):
+        decoded: list[ParallelRecord] = ParallelRecord.from_json_parallel(src, workers=2, chunk_size=1024)
+        assert [record.to_dict() for record in decoded] == records
+
+    assert ParallelRecord.from_json_parallel(b"[]") == []
+
+
+def test_aiter_json():
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor
+
+    @Object
+    class Event:
+        event_id: int
+        name: str
+
+    async def decode() -> list[Event]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'{"eventId": 1, "name": "start"}\n{"eventId": 2, "name": "%s"}\n' % (b"x" * 100))
+        reader.feed_eof()
+        return [event async for event in Event.aiter_json(reader, offload_size=64)]
+
+    events: list[Event] = asyncio.run(decode())
+    assert [event.event_id for event in events] == [1, 2]
+    assert events[1].name == "x" * 100
+
+    async def decode_in_processes() -> list[StreamedEvent]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'{"eventId": 1, "name": "start"}\n{"eventId": 2, "name": "%s"}\n' % (b"x" * 100))
+        reader.feed_eof()
+        with ProcessPoolExecutor(1) as executor:
+            return [event async for event in StreamedEvent.aiter_json(reader, offload_size=64, executor=executor)]
+
+    streamed: list[StreamedEvent] = asyncio.run(decode_in_processes())
+    assert streamed == [StreamedEvent(event_id=1, name="start"), StreamedEvent(event_id=2, name="x" * 100)]
+
+
+@Object
+class StreamedEvent:
+    event_id: int
+    name: str
+
+
+def test_track_changes():
+    @Object(slots=True, track_changes=True)
+    class Profile:
+        name: str
+        age: int
+        tags: list[str]
+
+    profile: Profile = Profile.from_json('{"name": "daniel", "age": 20, "tags": []}')
+    assert profile.to_dict(changed_only=True) == {}
+
+    profile.age = 21
+    assert profile.to_dict(changed_only=True) == {"age": 21}
+    assert json.loads(profile.to_json(changed_only=True)) == {"age": 21}
+    assert profile.to_dict() == {"name": "daniel", "age": 21, "tags": []}
+
+    profile.mark_clean()
+    assert profile.to_dict(changed_only=True) == {}
+    assert Profile.of(profile, deep=True).to_dict(changed_only=True) == {}
+
+    @Object
+    class Untracked:
+        name: str
+
+    try:
+        Untracked(name="x").to_dict(changed_only=True)
+        assert False
+    except Exception as e:
+        assert "does not track changes" in str(e)
+
+
+def test_diff():
+    @Object
+    class Settings:
+        retries: int
+        hosts: list[str]
+
+    @Object
+    class Service:
+        name: str
+        settings: Settings
+        replicas: list[Settings]
+
+    a: Service = Service(name="api", settings=Settings(retries=3, hosts=["a"]), replicas=[Settings(retries=1, hosts=[])])
+    b: Service = Service.of(a, deep=True)
+    assert Service.diff(a, b) == {}
+
+    b.settings.hosts.append("b")
+    b.replicas[0].retries = 2
+    patch: dict = Service.diff(a, b)
+    assert patch["settings"] == {"hosts": ["a", "b"]}
+    assert [replica.retries for replica in patch["replicas"]] == [2]
+    assert "name" not in patch
+
+    a.apply_patch(patch)
+    assert Service.diff(a, b) == {}
+    assert a.to_dict() == b.to_dict()
+
+
+def test_equality():
+    @Object
+    class Point:
+        x: int
+        y: int
+
+    assert Point(x=1, y=2) == Point.from_json('{"x": 1, "y": 2}', lazy=True)
+    assert Point(x=1, y=2) != Point(x=2, y=1)
+
+    # mutable Objects are unhashable, unless asked for
+    try:
+        {Point(x=1, y=2)}
+        assert False
+    except TypeError:
+        pass
+
+    @Object(unsafe_hash=True)
+    class Position:
+        x: int
+        y: int
+
+    assert len({Position(x=1, y=2), Position(x=1, y=2), Position(x=0, y=0)}) == 2
+
+    @Object(frozen=True)
+    class FrozenPoint:
+        x: int
+        y: int
+
+    @Object(slots=True, frozen=True)
+    class Key:
+        name: str
+        point: FrozenPoint
+
+    key: Key = Key(name="a", point=FrozenPoint(x=1, y=2))
+    assert key == Key.of(key, deep=True)
+    assert hash(key) == hash(Key(name="a", point=FrozenPoint(x=1, y=2)))
+    assert {key: 1}[Key.from_json('{"name": "a", "point": {"x": 1, "y": 2}}')] == 1
+
+    try:
+        key.name = "b"
+        assert False
+    except AttributeError:
+        pass
+    assert key.name == "a"
+
+
+def test_nested_decoding():
+    @Object(frozen=True)
+    class Leaf:
+        value: int
+
+    @Object
+    class Tree:
+        leaf: Leaf
+        leaves: list[Leaf]
+        named: dict[str, Leaf]
+        grouped: dict[str, list[Leaf]]
+        pair: tuple[Leaf, ...]
+        tags: set[str]
+        grid: list[list[Leaf]]
+
+    tree: Tree = Tree.from_json(json.dumps({
+        "leaf": {"value": 1},
+        "leaves": [{"value": 2}, None],
+        "named": {"a": {"value": 3}},
+        "grouped": {"b": [{"value": 4}]},
+        "pair": [{"value": 5}, {"value": 6}],
+        "tags": ["x", "y", "x"],
+        "grid": [[{"value": 7}], []],
+    }))
+    assert tree.leaf == Leaf(value=1)
+    assert tree.leaves == [Leaf(value=2), None]
+    assert tree.named == {"a": Leaf(value=3)}
+    assert tree.grouped == {"b": [Leaf(value=4)]}
+    assert tree.pair == (Leaf(value=5), Leaf(value=6))
+    assert tree.tags == {"x", "y"}
+    assert tree.grid == [[Leaf(value=7)], []]
+
+    for data in ('{"named": [1]}', '{"leaves": [1]}', '{"tags": {"x": 1}}'):
+        try:
+            Tree.from_json(data)
+            assert False
+        except Exception as e:
+            assert "Tree" in str(e) or "Leaf" in str(e)
+
+
+def test_null_items_round_trip():
+    @Object
+    class Leaf:
+        value: int
+
+    @Object
+    class Tree:
+        leaves: list[Leaf]
+        named: dict[str, Leaf]
+
+    data = '{"leaves": [{"value": 1}, null], "named": {"a": null, "b": {"value": 2}}}'
+    tree: Tree = Tree.from_json(data)
+    assert tree.to_dict() == json.loads(data)
+    assert json.loads(tree.to_json()) == json.loads(data)
+    assert json.loads(tree.to_json(direct=True)) == json.loads(data)
+
+    # keys which are not strings are written the way `json` writes them
+    tree.named = {1: Leaf(value=3), None: None}
+    assert tree.to_json(direct=True) == tree.to_json()
+
+
+def test_dump_json(tmp_path):
+    import io
+
+    @Object
+    class Row:
+        id: int
+        name: str
+
+    rows: list[Row] = [Row(id=i, name="row %d" % i) for i in range(100)]
+
+    text = io.StringIO()
+    rows[0].dump_json(text, chunk_size=4)
+    assert json.loads(text.getvalue()) == rows[0].to_dict()
+
+    path = tmp_path / "rows.ndjson"
+    with open(path, "wb") as fp:
+        Row.dump_json_many(rows, fp, chunk_size=128)
+    assert Row.from_json_many([json.loads(line) for line in path.read_text().splitlines()]) == rows
+
+    text = io.StringIO()
+    Row.dump_json_many(iter(rows), text, ndjson=False, direct=True, chunk_size=128)
+    assert text.getvalue() == json.dumps([row.to_dict() for row in rows])
+
+    empty = io.StringIO()
+    Row.dump_json_many([], empty, ndjson=False)
+    assert empty.getvalue() == "[]"
+
+
+def test_projection():
+    @Object
+    class Detail:
+        text: str
+
+    @Object
+    class Document:
+        document_id: int
+        created_at: str = "never"
+        details: list[Detail] = None
+
+    data: str = '{"documentId": 1, "createdAt": "today", "details": [{"text": 2}]}'
+    document: Document = Document.from_json(data, only=("document_id",))
+    assert document.document_id == 1 and document.created_at == "never" and document.details is None
+
+    documents: list[Document] = Document.from_json_many("[%s]" % data, only={"document_id", "created_at"})
+    assert documents[0].created_at == "today"
+
+    document.load_json('{"document_id": 2, "created_at": "now"}', only=["created_at"])
+    assert document.document_id == 1 and document.created_at == "now"
+    document.load_json('{"document_id": 3, "created_at": "later"}', only=(name for name in ["created_at"]))
+    assert document.document_id == 1 and document.created_at == "later"
+
+    try:
+        Document.from_json(data, only=("missing",))
+        assert False
+    except Exception as e:
+        assert "missing" in str(e)
+
+
+def test_rows():
+    import sqlite3
+
+    @Object
+    class User:
+        id: int
+        name: str
+        active: bool = True
+
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE users (id INTEGER, name TEXT, active INTEGER)")
+    users: list[User] = [User(id=1, name="a", active=True), User(id=2, name="b", active=False)]
+    connection.executemany("INSERT INTO users VALUES (?, ?, ?)", User.to_rows(users))
+
+    assert User.from_rows(connection.execute("SELECT id, name, active FROM users")) == [
+        User(id=1, name="a", active=1),
+        User(id=2, name="b", active=0),
+    ]
+
+    # columns which aren't fields are skipped with `None`, and missing fields get their defaults
+    cursor = connection.execute("SELECT name, 'ignored', id FROM users")
+    named: list[User] = User.from_rows(cursor, columns=["name", None, "id"])
+    assert [(user.id, user.name, user.active) for user in named] == [(1, "a", True), (2, "b", True)]
+    assert User.to_rows(named, columns=("name", None)) == [("a", None), ("b", None)]
+
+
+def test_fingerprint():
+    @Object(frozen=True)
+    class Tag:
+        name: str
+
+    @Object
+    class Article:
+        title: str
+        views: int
+        rating: float
+        tags: list[Tag]
+        meta: dict[str, str]
+        labels: set[str]
+
+    article: Article = Article(
+        title="a", views=1, rating=0.5, tags=[Tag(name="x")], meta={"a": "1", "b": "2"}, labels={"p", "q"}
+    )
+    same: Article = Article(
+        title="a", views=1, rating=0.5, tags=[Tag(name="x")], meta={"b": "2", "a": "1"}, labels={"q", "p"}
+    )
+    assert article.fingerprint() == same.fingerprint()
+    assert len(article.fingerprint()) == 32
+
+    same.views = 2
+    assert article.fingerprint() != same.fingerprint()
+    assert Article.from_json(article.to_json(), lazy=True).fingerprint() == article.fingerprint()
+
+    # fingerprints don't depend on the hash seed of the process, unlike `hash`
+    assert Tag(name="x").fingerprint() == "993a3559d5f105d1a52dffbcfa25f7fe"
+    assert Tag(name="x").fingerprint() != Tag(name="y").fingerprint()
+
+
+def test_identity_map():
+    @Object(key="id", identity_map_size=2)
+    class Account:
+        id: int
+        balance: int = 0
+
+    first: Account = Account.from_json('{"id": 1, "balance": 10}')
+    again: Account = Account.from_json('{"id": 1, "balance": 20}')
+    assert again is first and first.balance == 20
+    assert (Account.identity_map.hits, Account.identity_map.misses) == (1, 1)
+
+    # fields outside a projection are left as they are
+    assert Account.from_json('{"id": 1}', only=("id",)) is first and first.balance == 20
+
+    Account.from_json_many('[{"id": 2}, {"id": 3}]')
+    assert len(Account.identity_map) == 2 and Account.identity_map.evictions == 1
+    assert Account.from_json('{"id": 1}') is not first
+
+    @Object(frozen=True, key="id")
+    class Price:
+        id: str
+        amount: float
+        name: str = ""
+
+    price: Price = Price.from_json('{"id": "a", "amount": 1.5, "name": "widget"}')
+    assert Price.from_json('{"id": "a", "amount": 1.5, "name": "widget"}') is price
+    changed: Price = Price.from_json('{"id": "a", "amount": 2.5, "name": "widget"}')
+    assert changed is not price and price.amount == 1.5
+    assert Price.from_json('{"id": "a", "amount": 2.5, "name": "widget"}') is changed
+
+    # data without a key doesn't use the map, even though the key field is given its default value
+    assert Price.from_json('{"amount": 1.0}') is not Price.from_json('{"amount": 1.0}')
+    assert Price.from_json('{"id": null, "amount": 1.0}').id is None
+    assert len(Price.identity_map) == 1
+
+    # a projected decode of a frozen class keeps the fields outside the projection
+    projected: Price = Price.from_json('{"id": "a", "amount": 3.5}', only=("id", "amount"))
+    assert projected is not changed and (projected.amount, projected.name) == (3.5, "widget")
+    assert Price.from_json('{"id": "a"}', only=("id",)) is projected
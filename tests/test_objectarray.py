@@ -0,0 +1,75 @@
+from sushitools.types import Object, ObjectArray
+
+
+@Object
+class Reading:
+    sensor: str
+    value: float
+    count: int
+    valid: bool
+
+
+def make_readings() -> ObjectArray[Reading]:
+    return ObjectArray[Reading](
+        [Reading(sensor="s%d" % i, value=i * 0.5, count=i, valid=i % 2 == 0) for i in range(10)]
+    )
+
+
+def test_object_array():
+    readings = make_readings()
+    assert len(readings) == 10
+    assert ObjectArray[Reading] is type(readings)
+
+    reading: Reading = readings[3]
+    assert isinstance(reading, Reading)
+    assert (reading.sensor, reading.value, reading.count, reading.valid) == ("s3", 1.5, 3, False)
+    assert readings[-1].count == 9
+
+    assert list(readings.column("count")) == list(range(10))
+    assert [r.count for r in readings[2:5]] == [2, 3, 4]
+
+    valid = readings.filter([r.valid for r in readings])
+    assert [r.count for r in valid] == [0, 2, 4, 6, 8]
+    assert [r.count for r in readings.filter(lambda r: r.value > 3)] == [7, 8, 9]
+
+    readings.append(Reading(sensor="none"))
+    assert len(readings) == 11
+    assert readings[10].count is None and readings[10].valid is None
+    assert readings[0].valid is True
+
+
+def test_object_array_json():
+    readings = make_readings()
+    data = readings.to_json()
+
+    decoded = ObjectArray[Reading].from_json_many(data)
+    assert decoded.to_dict() == readings.to_dict()
+    assert decoded.to_dict()[1] == Reading.from_json_many(data)[1].to_dict()
+
+
+def test_object_array_numpy():
+    import pytest
+
+    numpy = pytest.importorskip("numpy")
+
+    readings = make_readings()
+    values = readings.column("value")
+    assert isinstance(values, numpy.ndarray) and values.sum() == 22.5
+
+    high = readings.filter(values >= 4)
+    assert list(high.column("count")) == [8, 9]
+    assert [r.sensor for r in high] == ["s8", "s9"]
+
+    # the array is left as it was if it cannot grow while a view is alive
+    count = readings.column("count")
+    try:
+        readings.append(Reading(sensor="new", value=1.0, count=1, valid=True))
+        assert False
+    except Exception as e:
+        assert "numpy views" in str(e)
+    assert len(readings) == 10 and [len(readings.column(name)) for name in ("sensor", "value", "valid")] == [10] * 3
+    assert readings[9].count == 9
+
+    del count, values
+    readings.append(Reading(sensor="new", value=1.0, count=1, valid=True))
+    assert len(readings) == 11 and readings[10].sensor == "new"
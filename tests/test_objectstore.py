@@ -0,0 +1,98 @@
+import os
+from sushitools.types import Object, ObjectStore
+
+
+@Object
+class User:
+    id: int
+    name: str
+    tags: list[str]
+
+
+def test_object_store(tmp_path):
+    path = tmp_path / "users.store"
+    with ObjectStore[User](path, key="id") as users:
+        assert ObjectStore[User] is type(users)
+        for i in range(10):
+            assert users.append(User(id=i, name="user %d" % i, tags=["t%d" % i])) == i
+        users.append(User(id=3, name="renamed", tags=[]))
+
+        assert len(users) == 11
+        assert users[4] == User(id=4, name="user 4", tags=["t4"])
+        assert users[-1].name == "renamed"
+        assert users.get(3).name == "renamed"
+        assert users.get(42) is None and 42 not in users
+
+    # the schema fingerprint is only kept in the header of the store, not in every record
+    with ObjectStore[User](path, key="id") as users:
+        assert os.path.getsize(path) == sum(len(user.to_bytes()) - 8 for user in users)
+        assert [user.id for user in users] == list(range(10)) + [3]
+        assert users.get(9).tags == ["t9"]
+
+
+def test_object_store_recovery(tmp_path):
+    path = tmp_path / "users.store"
+    with ObjectStore[User](path, key="id", format="json") as users:
+        users.extend(User(id=i, name="user %d" % i, tags=[]) for i in range(3))
+
+    # a record which was only partly written, and whose key was never written
+    with open(path, "ab") as fp:
+        fp.write(b'{"id": 3, "na')
+    with open(str(path) + ".keys", "rb") as fp:
+        keys = fp.read()
+    with open(str(path) + ".keys", "wb") as fp:
+        fp.write(keys.splitlines(keepends=True)[0])
+
+    with ObjectStore[User](path, key="id", format="json") as users:
+        assert len(users) == 3
+        assert users.get(2).name == "user 2"
+        users.append(User(id=3, name="user 3", tags=[]))
+        assert users[3].name == "user 3"
+
+
+@Object
+class Pair:
+    id: tuple[int, int]
+    name: str
+
+
+@Object
+class Renamed:
+    id: int
+    title: str
+    tags: list[str]
+
+
+def test_object_store_header(tmp_path):
+    path = tmp_path / "users.store"
+    with ObjectStore[User](path, key="id") as users:
+        users.append(User(id=1, name="user 1", tags=[]))
+
+        # keys which would not be read back as the same value are rejected before anything is written
+        try:
+            users.append(User(id=(1, 2), name="pair", tags=[]))
+            assert False
+        except Exception as e:
+            assert str(e) == "ObjectStore key 'id' cannot be a tuple"
+        assert len(users) == 1
+
+    try:
+        ObjectStore[Pair](tmp_path / "pairs.store", key="id")
+        assert False
+    except Exception as e:
+        assert str(e) == "ObjectStore key field 'id' must be one of str, int, float, bool"
+
+    try:
+        ObjectStore[User](path, format="json")
+        assert False
+    except Exception as e:
+        assert str(e) == "ObjectStore %s was written in binary format, not json" % path
+
+    try:
+        ObjectStore[Renamed](path)
+        assert False
+    except Exception as e:
+        assert str(e) == "ObjectStore %s was written with a different Renamed schema" % path
+
+    with ObjectStore[User](path, key="id") as users:
+        assert len(users) == 1 and users.get(1).name == "user 1"